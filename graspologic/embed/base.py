@@ -305,7 +305,14 @@ class BaseEmbedMulti(BaseSpectralEmbed):
         if isinstance(graphs, list):
             out = [augment_diagonal(g) for g in graphs]
         elif isinstance(graphs, np.ndarray):
-            # Copying is necessary to not overwrite input array
-            out = np.array([augment_diagonal(graphs[i]) for i in range(self.n_graphs_)])
+            # Same as calling augment_diagonal on each graph, vectorized over the
+            # stack. Copying is necessary to not overwrite input array
+            out = graphs.copy()
+            n_vertices = out.shape[-1]
+            diag_idx = np.arange(n_vertices)
+            out[:, diag_idx, diag_idx] = 0
+            abs_out = np.abs(out)
+            degrees = (abs_out.sum(axis=1) + abs_out.sum(axis=2)) / 2
+            out[:, diag_idx, diag_idx] = degrees / (n_vertices - 1)
 
         return out
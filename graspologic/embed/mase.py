@@ -1,13 +1,32 @@
 # Copyright (c) Microsoft Corporation and contributors.
 # Licensed under the MIT License.
 
+from functools import partial
+
 import numpy as np
+from joblib import Parallel, delayed
 
 from .base import BaseEmbedMulti
 from .svd import select_dimension, selectSVD
 from ..utils import is_almost_symmetric
 
 
+def _compute_scores(graphs, left, right):
+    """
+    Computes left^T @ graph @ right for each graph.
+    """
+    if isinstance(graphs, np.ndarray):
+        # Multiply the whole stack by ``right`` as a single (m * n, n) @ (n, d) gemm,
+        # then contract with ``left`` in one batched matmul.
+        n_graphs, n_vertices, _ = graphs.shape
+        projected = (graphs.reshape(n_graphs * n_vertices, n_vertices) @ right).reshape(
+            n_graphs, n_vertices, -1
+        )
+        return left.T @ projected
+    else:
+        return np.asarray([left.T @ graph @ right for graph in graphs])
+
+
 class MultipleASE(BaseEmbedMulti):
     r"""
     Multiple Adjacency Spectral Embedding (MASE) embeds arbitrary number of input
@@ -70,6 +89,18 @@ class MultipleASE(BaseEmbedMulti):
         If graph(s) are directed, whether to concatenate each graph's left and right (out and in) latent positions
         along axis 1.
 
+    dtype : {None, np.float32, np.float64}, optional (default None)
+        Floating point precision used for the embedding computations. If None, the
+        precision of the input graphs is kept. ``np.float32`` halves the memory
+        used by the input graphs and speeds up the SVDs, at a small cost in
+        accuracy.
+
+    n_jobs : int or None, optional (default None)
+        The number of jobs to run in parallel. Parallelization is over the individual
+        graph embeddings, which run in threads since the SVDs release the GIL. None
+        means 1 unless in a joblib.parallel_backend context. -1 means using all
+        processors. See :class:`joblib.Parallel` for more details.
+
 
     Attributes
     ----------
@@ -112,10 +143,19 @@ class MultipleASE(BaseEmbedMulti):
         scaled=True,
         diag_aug=True,
         concat=False,
+        dtype=None,
+        n_jobs=None,
     ):
         if not isinstance(scaled, bool):
             msg = "scaled must be a boolean, not {}".format(scaled)
             raise TypeError(msg)
+        if dtype is not None and np.dtype(dtype) not in (np.float32, np.float64):
+            msg = (
+                "dtype must be one of {{None, np.float32, np.float64}}, not {}".format(
+                    dtype
+                )
+            )
+            raise ValueError(msg)
 
         super().__init__(
             n_components=n_components,
@@ -126,25 +166,37 @@ class MultipleASE(BaseEmbedMulti):
             concat=concat,
         )
         self.scaled = scaled
+        self.dtype = dtype
+        self.n_jobs = n_jobs
 
-    def _reduce_dim(self, graphs):
+    def _reduce_dim(self, graphs, need_right=True):
         if self.n_components is None:
             # first embed into log2(n_vertices) for each graph
             n_components = int(np.ceil(np.log2(np.min(self.n_vertices_))))
         else:
             n_components = self.n_components
 
+        # Bind the solver settings once, shared by both svd stages
+        svd = partial(selectSVD, algorithm=self.algorithm, n_iter=self.n_iter)
+
         # embed individual graphs
-        embeddings = [
-            selectSVD(
-                graph,
-                n_components=n_components,
-                algorithm=self.algorithm,
-                n_iter=self.n_iter,
+        if self.algorithm == "full" and isinstance(graphs, np.ndarray):
+            # Stacked graphs can be decomposed with a single batched svd call
+            if n_components > min(graphs.shape[1:]):
+                msg = "n_components must be <= min(X.shape)."
+                raise ValueError(msg)
+            Us, Ds, Vs = np.linalg.svd(graphs, full_matrices=False)
+            Us = Us[..., :n_components]
+            Ds = Ds[:, :n_components]
+            Vs = Vs[:, :n_components, :]
+        else:
+            n_graphs = len(graphs)
+            Us, Ds, Vs = [None] * n_graphs, [None] * n_graphs, [None] * n_graphs
+            embeddings = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                delayed(svd)(graph, n_components=n_components) for graph in graphs
             )
-            for graph in graphs
-        ]
-        Us, Ds, Vs = zip(*embeddings)
+            for i, (U, D, V) in enumerate(embeddings):
+                Us[i], Ds[i], Vs[i] = U, D, V
 
         # Choose the best embedding dimension for each graphs
         if self.n_components is None:
@@ -158,40 +210,39 @@ class MultipleASE(BaseEmbedMulti):
         else:
             best_dimension = self.n_components
 
-        if not self.scaled:
-            Us = np.hstack([U[:, :best_dimension] for U in Us])
-            Vs = np.hstack([V.T[:, :best_dimension] for V in Vs])
-        else:
-            # Equivalent to ASE
-            Us = np.hstack(
-                [
-                    U[:, :best_dimension] @ np.diag(np.sqrt(D[:best_dimension]))
-                    for U, D in zip(Us, Ds)
-                ]
-            )
-            Vs = np.hstack(
-                [
-                    V.T[:, :best_dimension] @ np.diag(np.sqrt(D[:best_dimension]))
-                    for V, D in zip(Vs, Ds)
-                ]
-            )
+        # Write each graph's embedding directly into preallocated horizontal stacks.
+        # The right singular vectors are only needed for directed graphs.
+        n_graphs = len(Us)
+        dtype = np.result_type(Us[0], Ds[0])
+        stacked_shape = (self.n_vertices_, n_graphs * best_dimension)
+        Us_stacked = np.empty(stacked_shape, dtype=dtype)
+        Vs_stacked = np.empty(stacked_shape, dtype=dtype) if need_right else None
+        for i, (U, D, V) in enumerate(zip(Us, Ds, Vs)):
+            columns = slice(i * best_dimension, (i + 1) * best_dimension)
+            if not self.scaled:
+                Us_stacked[:, columns] = U[:, :best_dimension]
+                if need_right:
+                    Vs_stacked[:, columns] = V[:best_dimension].T
+            else:
+                # Equivalent to ASE. Scaling columns by broadcasting is the same as
+                # right multiplying by diag(sqrt(D)), without building the diagonal
+                scale = np.sqrt(D[:best_dimension])
+                np.multiply(U[:, :best_dimension], scale, out=Us_stacked[:, columns])
+                if need_right:
+                    np.multiply(V[:best_dimension].T, scale, out=Vs_stacked[:, columns])
+        Us, Vs = Us_stacked, Vs_stacked
 
         # Second SVD for vertices
         # The notation is slightly different than the paper
-        Uhat, sing_vals_left, _ = selectSVD(
-            Us,
-            n_components=self.n_components,
-            n_elbows=self.n_elbows,
-            algorithm=self.algorithm,
-            n_iter=self.n_iter,
+        Uhat, sing_vals_left, _ = svd(
+            Us, n_components=self.n_components, n_elbows=self.n_elbows
         )
 
-        Vhat, sing_vals_right, _ = selectSVD(
-            Vs,
-            n_components=self.n_components,
-            n_elbows=self.n_elbows,
-            algorithm=self.algorithm,
-            n_iter=self.n_iter,
+        if not need_right:
+            return Uhat, None, sing_vals_left, None
+
+        Vhat, sing_vals_right, _ = svd(
+            Vs, n_components=self.n_components, n_elbows=self.n_elbows
         )
         return Uhat, Vhat, sing_vals_left, sing_vals_right
 
@@ -213,23 +264,40 @@ class MultipleASE(BaseEmbedMulti):
         """
         graphs = self._check_input_graphs(graphs)
 
+        if self.dtype is not None:
+            if isinstance(graphs, np.ndarray):
+                graphs = np.ascontiguousarray(graphs, dtype=self.dtype)
+            else:
+                graphs = [graph.astype(self.dtype, copy=False) for graph in graphs]
+
         # Check if undirected
-        undirected = all(is_almost_symmetric(g) for g in graphs)
+        if isinstance(graphs, np.ndarray):
+            # Check the whole stack at once; exact equality is a cheap early out for
+            # binary graphs, otherwise use the same tolerance as is_almost_symmetric
+            transposed = np.swapaxes(graphs, 1, 2)
+            undirected = bool(
+                np.array_equal(graphs, transposed)
+                or np.abs(graphs - transposed).max() <= 1e-15
+            )
+        else:
+            undirected = all(is_almost_symmetric(g) for g in graphs)
 
         # Diag augment
         if self.diag_aug:
             graphs = self._diag_aug(graphs)
 
         # embed
-        Uhat, Vhat, sing_vals_left, sing_vals_right = self._reduce_dim(graphs)
+        Uhat, Vhat, sing_vals_left, sing_vals_right = self._reduce_dim(
+            graphs, need_right=not undirected
+        )
         self.latent_left_ = Uhat
         if not undirected:
             self.latent_right_ = Vhat
-            self.scores_ = np.asarray([Uhat.T @ graph @ Vhat for graph in graphs])
+            self.scores_ = _compute_scores(graphs, Uhat, Vhat)
             self.singular_values_ = (sing_vals_left, sing_vals_right)
         else:
             self.latent_right_ = None
-            self.scores_ = np.asarray([Uhat.T @ graph @ Uhat for graph in graphs])
+            self.scores_ = _compute_scores(graphs, Uhat, Uhat)
             self.singular_values_ = sing_vals_left
 
         return self
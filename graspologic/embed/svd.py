@@ -4,7 +4,6 @@
 import numpy as np
 import scipy
 import sklearn
-from scipy.stats import norm
 from scipy.sparse import isspmatrix_csr
 
 
@@ -15,37 +14,37 @@ def _compute_likelihood(arr):
     the likelihood will be nan.
     """
     n_elements = len(arr)
-    likelihoods = np.zeros(n_elements)
-
-    for idx in range(1, n_elements + 1):
-        # split into two samples
-        s1 = arr[:idx]
-        s2 = arr[idx:]
-
-        # deal with when input only has 2 elements
-        if (s1.size == 1) & (s2.size == 1):
-            likelihoods[idx - 1] = -np.inf
-            continue
-
-        # compute means
-        mu1 = np.mean(s1)
-        if s2.size != 0:
-            mu2 = np.mean(s2)
-        else:
-            # Prevent numpy warning for taking mean of empty array
-            mu2 = -np.inf
 
-        # compute pooled variance
-        variance = ((np.sum((s1 - mu1) ** 2) + np.sum((s2 - mu2) ** 2))) / (
-            n_elements - 1 - (idx < n_elements)
+    # Evaluate every split point at once. Cumulative sums of the centered values
+    # give the sums of squares of both samples for each split.
+    centered = arr - np.mean(arr)
+    n1 = np.arange(1, n_elements + 1)
+    n2 = n_elements - n1
+    csum = np.cumsum(centered)
+    csum_sq = np.cumsum(centered ** 2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ss1 = csum_sq - csum ** 2 / n1
+        ss2 = np.where(
+            n2 > 0, (csum_sq[-1] - csum_sq) - (csum[-1] - csum) ** 2 / n2, 0.0
         )
-        std = np.sqrt(variance)
+        ss = ss1 + ss2
+        # splits of tied values leave rounding error instead of exact zeros, so
+        # anything within it of zero has no variance
+        ss[ss <= n_elements * np.finfo(ss.dtype).eps * csum_sq[-1]] = 0.0
+
+        # compute pooled variance
+        variance = ss / (n_elements - 1 - (n1 < n_elements))
 
-        # compute log likelihoods
-        likelihoods[idx - 1] = np.sum(norm.logpdf(s1, loc=mu1, scale=std)) + np.sum(
-            norm.logpdf(s2, loc=mu2, scale=std)
+        # sum of normal log likelihoods of both samples under the pooled variance
+        likelihoods = -ss / (2 * variance) - n_elements / 2 * np.log(
+            2 * np.pi * variance
         )
 
+    # deal with when input only has 2 elements
+    if n_elements == 2:
+        likelihoods[0] = -np.inf
+
     return likelihoods
 
 
@@ -170,7 +169,9 @@ def select_dimension(
         return elbows, values
 
 
-def selectSVD(X, n_components=None, n_elbows=2, algorithm="randomized", n_iter=5):
+def selectSVD(
+    X, n_components=None, n_elbows=2, algorithm="randomized", n_iter=5, svd_seed=0
+):
     r"""
     Dimensionality reduction using SVD.
 
@@ -209,6 +210,10 @@ def selectSVD(X, n_components=None, n_elbows=2, algorithm="randomized", n_iter=5
         Number of iterations for randomized SVD solver. Not used by 'full' or
         'truncated'. The default is larger than the default in randomized_svd
         to handle sparse matrices that may have large slowly decaying spectrum.
+    svd_seed : int or None, optional (default = 0)
+        Seed for the random test matrix used by the 'randomized' solver, so that
+        repeated decompositions of the same matrix give the same result. If None,
+        the global numpy random state is used. Not used by 'full' or 'truncated'.
 
     Returns
     -------
@@ -264,6 +269,8 @@ def selectSVD(X, n_components=None, n_elbows=2, algorithm="randomized", n_iter=5
         U = U[:, idx]
         V = V[idx, :]
     elif algorithm == "randomized":
-        U, D, V = sklearn.utils.extmath.randomized_svd(X, n_components, n_iter=n_iter)
+        U, D, V = sklearn.utils.extmath.randomized_svd(
+            X, n_components, n_iter=n_iter, random_state=svd_seed
+        )
 
     return U, D, V
@@ -1,46 +1,49 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
-import atexit
-from itertools import cycle
+from functools import lru_cache
 import json
-import math
 import numpy as np
-import os
 from pathlib import Path
-import pkg_resources
-from sklearn.preprocessing import minmax_scale
-from typing import Any, Dict, Optional, Tuple
+import pickle
+from typing import Any, Dict, Optional, Tuple, Union
 
 
 __all__ = ["categorical_colors", "sequential_colors"]
 
+_INCLUDE_PATH = Path(__file__).parent.joinpath("include")
+
+
+def _read_json(path: Union[str, Path]) -> Dict[Any, Any]:
+    with open(path) as json_io:
+        return json.load(json_io)
+
 
 def _load_thematic_json(path: Optional[str]) -> Tuple[Dict[Any, Any], Dict[Any, Any]]:
     if path is not None and Path(path).is_file():
-        colors_path = path
+        thematic_json = _read_json(path)
     else:
-        atexit.register(pkg_resources.cleanup_resources)
-        include_path = pkg_resources.resource_filename(__package__, "include")
-        colors_path = os.path.join(include_path, "colors-100.json")
+        # the bundled theme ships with a pre-parsed pickle of colors-100.json so we
+        # can skip json decoding; fall back to the json if it is missing
+        pickled_path = _INCLUDE_PATH.joinpath("colors-100.pkl")
+        if pickled_path.is_file():
+            with open(pickled_path, "rb") as pickled_io:
+                thematic_json = pickle.load(pickled_io)
+        else:
+            thematic_json = _read_json(_INCLUDE_PATH.joinpath("colors-100.json"))
 
-    with open(colors_path) as thematic_json_io:
-        thematic_json = json.load(thematic_json_io)
     light = thematic_json["light"]
     dark = thematic_json["dark"]
     return light, dark
 
 
-_CACHED_LIGHT, _CACHED_DARK = _load_thematic_json(None)
+@lru_cache(maxsize=8)
+def _themes(theme_path: Optional[str]) -> Tuple[Dict[Any, Any], Dict[Any, Any]]:
+    return _load_thematic_json(theme_path)
 
 
 def _get_colors(light_background: bool, theme_path: Optional[str]) -> Dict[Any, Any]:
-    (
-        light,
-        dark,
-    ) = _CACHED_LIGHT, _CACHED_DARK if theme_path is None else _load_thematic_json(
-        theme_path
-    )
+    light, dark = _themes(theme_path)
     return light if light_background else dark
 
 
@@ -85,20 +88,18 @@ def categorical_colors(
 
     """
     color_scheme = _get_colors(light_background, theme_path)
-    partition_populations = {}
-    for node_id, partition in partitions.items():
-        count = partition_populations.get(partition, 0) + 1
-        partition_populations[partition] = count
+    nominal = color_scheme["nominal"]
+    num_colors = len(nominal)
 
-    ordered_partitions = sorted(
-        partition_populations.items(), key=lambda x: x[1], reverse=True
+    unique_partitions, first_seen, counts = np.unique(
+        np.asarray(list(partitions.values())), return_index=True, return_counts=True
     )
-    nominal_cycle = cycle(color_scheme["nominal"])
-    colors_by_partitions = {}
-    for index, item in enumerate(ordered_partitions):
-        partition, _ = item
-        color = next(nominal_cycle)
-        colors_by_partitions[partition] = color
+    # population descending, ties broken by first appearance
+    ordered = np.lexsort((first_seen, -counts))
+    colors_by_partitions = {
+        unique_partitions[partition_index].item(): nominal[index % num_colors]
+        for index, partition_index in enumerate(ordered)
+    }
 
     colors_by_node = {
         node_id: colors_by_partitions[partition]
@@ -137,7 +138,7 @@ def sequential_colors(
         Default is ``True``. Colors selected for a light background will be slightly
         different in hue and saturation to complement a light or dark background.
     use_log_scale : bool
-        Default is ``False``.
+        Default is ``False``. If ``True``, all values must be positive.
     theme_path : Optional[str]
         A color scheme is provided with ``graspologic``, but if you wish to use your own
         you can generate one with `Thematic <https://microsoft.github.io/thematic>`_ and
@@ -149,6 +150,11 @@ def sequential_colors(
         Returns a dictionary of node id -> color based on the original value
         provided for the node as it relates to the total range of all values.
 
+    Raises
+    ------
+    ValueError
+        If ``use_log_scale`` is ``True`` and any value is not positive.
+
     """
     color_scheme = _get_colors(light_background, theme_path)
     color_list = color_scheme["sequential"]
@@ -156,16 +162,22 @@ def sequential_colors(
 
     keys, values = zip(*node_and_value.items())
 
+    np_values = np.asarray(values, dtype=np.float64)
     if use_log_scale:
-        values = map(math.log, values)
-
-    np_values = np.array(values).reshape(1, -1)
-    new_values = minmax_scale(np_values, feature_range=(0, num_colors - 1), axis=1)
-    node_colors = {}
-    for key_index, node_id in enumerate(keys):
-        index = int(new_values[0, key_index])
+        if not np.all(np_values > 0):
+            raise ValueError("All values must be positive when use_log_scale is True")
+        np_values = np.log(np_values)
+
+    min_value = np_values.min()
+    value_range = np_values.max() - min_value
+    if value_range == 0:
+        indices = np.zeros(np_values.shape, dtype=np.intp)
+    else:
+        indices = ((np_values - min_value) * ((num_colors - 1) / value_range)).astype(
+            np.intp
+        )
+        np.clip(indices, 0, num_colors - 1, out=indices)
 
-        color = color_list[index]
-        node_colors[node_id] = color
+    node_colors = dict(zip(keys, (color_list[index] for index in indices)))
 
     return node_colors
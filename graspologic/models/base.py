@@ -26,6 +26,21 @@ def _check_n_samples(n_samples):
         )
 
 
+def _potential_edge_masks(n_verts, directed, loops):
+    """
+    Returns boolean masks of the entries of an adjacency matrix that represent
+    potential edges, in the order their entries are listed, or None if every entry
+    does. Masks take an eighth of the memory of index arrays.
+    """
+    if directed and loops:
+        return None
+    lower = np.tri(n_verts, k=-1, dtype=bool)
+    if not directed:
+        # ignore lower half of graph, symmetric, and the diagonal unless loops
+        return (~lower,) if loops else (lower.T,)
+    return lower, lower.T
+
+
 def _n_to_labels(n):
     n_cumsum = n.cumsum()
     labels = np.zeros(n.sum(), dtype=np.int64)
@@ -116,20 +131,10 @@ class BaseGraphEstimator(BaseEstimator):
         if np.shape(p_mat) != np.shape(graph):
             raise ValueError("Input graph size must be the same size as P matrix")
 
-        inds = None
-        if not self.directed and self.loops:
-            inds = np.triu_indices_from(graph)  # ignore lower half of graph, symmetric
-        elif not self.directed and not self.loops:
-            inds = np.triu_indices_from(graph, k=1)  # ignore the diagonal
-        elif self.directed and not self.loops:
-            xu, yu = np.triu_indices_from(graph, k=1)
-            xl, yl = np.tril_indices_from(graph, k=-1)
-            x = np.concatenate((xl, xu))
-            y = np.concatenate((yl, yu))
-            inds = (x, y)
-        if inds is not None:
-            p_mat = p_mat[inds]
-            graph = graph[inds]
+        masks = _potential_edge_masks(graph.shape[0], self.directed, self.loops)
+        if masks is not None:
+            p_mat = np.concatenate([p_mat[mask] for mask in masks])
+            graph = np.concatenate([graph[mask] for mask in masks])
 
         # clip the probabilities that are degenerate
         if clip is not None:
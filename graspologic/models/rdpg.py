@@ -133,7 +133,7 @@ class RDPGEstimator(BaseGraphEstimator):
             self.directed = False
         p_mat = X @ Y.T
         if not self.loops:
-            p_mat -= np.diag(np.diag(p_mat))
+            np.fill_diagonal(p_mat, 0)
         self.p_mat_ = p_mat
         return self
 
@@ -390,7 +390,7 @@ class DCSBMEstimator(BaseGraphEstimator):
         block_vert_inds, block_inds, block_inv = _get_block_indices(y)
 
         if not self.loops:
-            graph = graph - np.diag(np.diag(graph))
+            np.fill_diagonal(graph, 0)
         block_p = _calculate_block_p(graph, block_inds, block_vert_inds)
 
         out_degree = np.count_nonzero(graph, axis=1).astype(float)
@@ -418,7 +418,7 @@ class DCSBMEstimator(BaseGraphEstimator):
         p_mat = p_mat * np.outer(degree_corrections[:, 0], degree_corrections[:, -1])
 
         if not self.loops:
-            p_mat -= np.diag(np.diag(p_mat))
+            np.fill_diagonal(p_mat, 0)
         self.p_mat_ = p_mat
         self.block_p_ = block_p
         return self
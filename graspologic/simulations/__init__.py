@@ -1,7 +1,16 @@
 # Copyright (c) Microsoft Corporation and contributors.
 # Licensed under the MIT License.
 
-from .simulations import sample_edges, er_np, er_nm, sbm, rdpg, p_from_latent, mmsbm
+from .simulations import (
+    sample_edges,
+    er_np,
+    er_nm,
+    sbm,
+    sbm_batch,
+    rdpg,
+    p_from_latent,
+    mmsbm,
+)
 from .simulations_corr import sample_edges_corr, er_corr, sbm_corr
 from .rdpg_corr import rdpg_corr
 
@@ -10,6 +19,7 @@ __all__ = [
     "er_np",
     "er_nm",
     "sbm",
+    "sbm_batch",
     "rdpg",
     "p_from_latent",
     "sample_edges_corr",
@@ -75,15 +75,15 @@ def rdpg_corr(X, Y, r, rescale=False, directed=False, loops=False):
     Then sample a correlated RDPG graph pair:
 
     >>> rdpg_corr(X, Y, 0.3, rescale=False, directed=False, loops=False)
-    (array([[0., 1., 0., 1., 0.],
-           [1., 0., 0., 1., 1.],
-           [0., 0., 0., 0., 0.],
-           [1., 1., 0., 0., 0.],
-           [0., 1., 0., 0., 0.]]), array([[0., 1., 0., 1., 0.],
-           [1., 0., 0., 0., 1.],
-           [0., 0., 0., 0., 0.],
+    (array([[0., 1., 0., 1., 1.],
+           [1., 0., 1., 0., 0.],
+           [0., 1., 0., 0., 0.],
            [1., 0., 0., 0., 0.],
-           [0., 1., 0., 0., 0.]]))
+           [1., 0., 0., 0., 0.]]), array([[0., 1., 0., 1., 0.],
+           [1., 0., 1., 0., 0.],
+           [0., 1., 0., 0., 0.],
+           [1., 0., 0., 0., 0.],
+           [0., 0., 0., 0., 0.]]))
     """
     # check r
     if not np.issubdtype(type(r), np.floating):
@@ -3,20 +3,379 @@
 
 import numpy as np
 
-from ..utils import symmetrize, cartesian_product
-from sklearn.utils import check_array, check_scalar
+from scipy.sparse import csr_matrix
+from sklearn.utils import check_array, check_random_state, check_scalar
 import warnings
 
 
+# Edge probability below which binary graphs are sampled by drawing the number of
+# edges and then their positions, instead of testing every pair of vertices
+_SPARSE_P = 0.02
+
+# Number of uniform draws made at a time when sampling dense binary graphs
+_DRAW_CHUNK = 1 << 18
+
+# Number of rows of the upper triangle mirrored at a time when symmetrizing
+_MIRROR_TILE = 256
+
+# Number of rows of P computed at a time from latent positions with at most
+# _PANEL_MAX_DIM dimensions; with more dimensions the product is compute bound
+_PANEL_ROWS = 256
+_PANEL_MAX_DIM = 32
+
+
 def _n_to_labels(n):
-    n_cumsum = n.cumsum()
-    labels = np.zeros(n.sum(), dtype=np.int64)
-    for i in range(1, len(n)):
-        labels[n_cumsum[i - 1] : n_cumsum[i]] = i
-    return labels
+    return np.repeat(np.arange(len(n), dtype=np.int64), np.asarray(n))
+
+
+def _symmetrize_upper(A):
+    """
+    Symmetrizes ``A`` in place by mirroring its upper triangle, given that its
+    strict lower triangle is zero. Works for both numeric and boolean matrices.
+
+    The upper triangle is copied over a strip of ``_MIRROR_TILE`` rows at a time,
+    so no temporary copy of ``A`` is made. Allocate ``A`` with ``np.full`` rather
+    than ``np.zeros``; writing the lower triangle of a lazily zeroed array is
+    about twice as slow.
+    """
+    n_verts = A.shape[0]
+    for start in range(0, n_verts, _MIRROR_TILE):
+        stop = min(start + _MIRROR_TILE, n_verts)
+        A[stop:, start:stop] = A[start:stop, stop:].T
+        block = A[start:stop, start:stop]
+        block += np.triu(block, 1).T
+    return A
+
+
+def _check_rng(rng):
+    if rng is None:
+        # the global numpy random state, so that np.random.seed still applies
+        return check_random_state(None)
+    if not isinstance(rng, (np.random.Generator, np.random.RandomState)):
+        msg = "rng must be a numpy.random.Generator, a numpy.random.RandomState or "
+        msg += "None, not {}.".format(type(rng))
+        raise TypeError(msg)
+    return rng
+
+
+def _check_probabilities(P, name="P"):
+    """
+    Raises a ValueError unless every entry of ``P`` is between 0 and 1. Sampling by
+    comparing uniforms against ``P`` does not check this itself.
+    """
+    # NaN fails both comparisons
+    if P.size and not (P.min() >= 0 and P.max() <= 1):
+        msg = "Values in {} must be in between 0 and 1.".format(name)
+        raise ValueError(msg)
+
+
+def _sample_bernoulli(out, probs, rng, upper=False):
+    """
+    Fills the 2d boolean array ``out`` with Bernoulli draws whose probabilities
+    ``probs`` broadcast against ``out``. The uniforms are drawn a few rows at a time
+    so they stay in cache.
+
+    If ``upper``, only the upper triangle of ``out`` is sampled, drawing each chunk
+    of rows from its diagonal onwards, and ``out`` must start out as zeros.
+
+    Generators fill the same buffer of uniforms for every chunk, so no temporary
+    arrays are allocated inside the loop.
+    """
+    n_rows, n_cols = out.shape
+    probs = np.broadcast_to(probs, out.shape)
+    step = min(max(1, _DRAW_CHUNK // max(n_cols, 1)), max(n_rows, 1))
+    if isinstance(rng, np.random.Generator):
+        buffer = np.empty(step * n_cols)
+    else:
+        buffer = None
+    if upper:
+        keep = np.triu(np.ones((step, step), dtype=bool))
+    for start in range(0, n_rows, step):
+        stop = min(start + step, n_rows)
+        first = start if upper else 0
+        shape = (stop - start, n_cols - first)
+        if buffer is None:
+            uniforms = rng.random(shape)
+        else:
+            uniforms = buffer[: shape[0] * shape[1]].reshape(shape)
+            rng.random(out=uniforms)
+        np.less(uniforms, probs[start:stop, first:], out=out[start:stop, first:])
+        if upper:
+            # clear what was drawn below the diagonal
+            block = out[start:stop, start:stop]
+            block &= keep[: block.shape[0], : block.shape[1]]
+    return out
+
+
+def _sample_dc(dc, dc_kws, size):
+    """
+    Draws ``size`` degree corrections from the function ``dc``. Functions that take
+    a ``size`` argument, like the numpy samplers, are called once; any other
+    function is called once per vertex.
+    """
+    try:
+        draws = np.asarray(dc(size=size, **dc_kws), dtype=float)
+    except TypeError:
+        draws = None
+    if draws is None or draws.shape != (size,):
+        draws = np.fromiter(
+            (dc(**dc_kws) for _ in range(size)), dtype=float, count=size
+        )
+    return draws
+
+
+def _sample_distinct(pool_size, size, rng):
+    """
+    Uniformly samples ``size`` distinct integers from ``range(pool_size)``. The cost
+    scales with the smaller of ``size`` and ``pool_size - size``, plus a pass over
+    ``pool_size`` when more than half of it is sampled.
+    """
+    if 2 * size > pool_size:
+        # draw the values left out instead, since drawing until nearly every value
+        # has come up takes many rounds
+        keep = np.full(pool_size, True)
+        keep[_sample_distinct(pool_size, pool_size - size, rng)] = False
+        return np.flatnonzero(keep)
+    if isinstance(rng, np.random.Generator):
+        integers = rng.integers
+    else:
+        integers = rng.randint
+    draws = np.empty(0, dtype=np.int64)
+    first = draws
+    while len(first) < size:
+        # the first occurrences of the values in a sequence of uniform draws are a
+        # uniform sample without replacement, so keep drawing until there are
+        # enough of them
+        n_draws = int(1.1 * (size - len(first))) + 16
+        draws = np.concatenate(
+            (draws, integers(pool_size, size=n_draws, dtype=np.int64))
+        )
+        _, first = np.unique(draws, return_index=True)
+    return draws[np.sort(first)[:size]]
+
+
+def _sample_weighted(weights, size, rng):
+    """
+    Samples ``size`` distinct indices of ``weights`` without replacement, each
+    draw picking among the remaining indices in proportion to their weights, like
+    ``rng.choice(len(weights), size, replace=False, p=weights)``. Indices with zero
+    weight are never picked, so ``size`` cannot exceed their number.
+
+    Each index gets an exponential key scaled by its inverse weight and the
+    ``size`` smallest keys win [1]_, which takes one pass over ``weights`` instead
+    of one for every round of draws.
+
+    References
+    ----------
+    .. [1] Efraimidis, P.S. and Spirakis, P.G. "Weighted random sampling with a
+        reservoir," Information Processing Letters, 97(5), pp.181-185, 2006
+    """
+    with np.errstate(divide="ignore"):
+        keys = rng.standard_exponential(len(weights)) / weights
+    return np.argpartition(keys, min(size, len(weights) - 1))[:size]
+
+
+def _unravel_edges(index, n, directed, loops):
+    """
+    Converts positions in the row-major list of the vertex pairs an ``n`` vertex
+    graph can connect into row and column indices. Undirected graphs only list the
+    upper triangle, and the diagonal is only listed if ``loops``.
+    """
+    index = np.asarray(index, dtype=np.int64)
+    if directed:
+        if loops:
+            return np.divmod(index, n)
+        rows, cols = np.divmod(index, n - 1)
+        # skip over the diagonal
+        cols += cols >= rows
+        return rows, cols
+    # closed form inverse of the row-major numbering of the strict upper triangle;
+    # the upper triangle with the diagonal is the strict upper triangle of a graph
+    # with one more vertex, shifted left by one column
+    size = n + 1 if loops else n
+    n_pairs = size * (size - 1) // 2
+    rows = size - 2 - np.floor(np.sqrt(8 * (n_pairs - index) - 7) / 2 - 0.5)
+    rows = rows.astype(np.int64)
+    remaining = size - rows
+    cols = index + rows + 1 - n_pairs + remaining * (remaining - 1) // 2
+    if loops:
+        cols -= 1
+    return rows, cols
+
+
+def _sample_sparse_edges(n_rows, n_cols, p, diagonal, directed, loops, rng):
+    """
+    Samples the edges of an ``n_rows`` by ``n_cols`` block of a binary graph with
+    edge probability ``p`` by drawing the number of edges, then their positions.
+    If ``diagonal``, the block lies on the diagonal of the adjacency matrix and
+    only the vertex pairs allowed by ``directed`` and ``loops`` are sampled.
+
+    Returns the row and column indices of the edges within the block.
+    """
+    if not diagonal:
+        pool_size = n_rows * n_cols
+    elif directed:
+        pool_size = n_rows * n_rows if loops else n_rows * (n_rows - 1)
+    else:
+        pool_size = n_rows * (n_rows + 1) // 2 if loops else n_rows * (n_rows - 1) // 2
+    index = _sample_distinct(pool_size, rng.binomial(pool_size, p), rng)
+    if diagonal:
+        return _unravel_edges(index, n_rows, directed, loops)
+    return np.divmod(index, n_cols)
 
 
-def sample_edges(P, directed=False, loops=False):
+def _check_n_p(n, p):
+    """
+    Validates the community sizes ``n`` and the block probabilities ``p`` of an SBM
+    and returns them as arrays.
+    """
+    # Check n
+    if not isinstance(n, (list, np.ndarray)):
+        msg = "n must be a list or np.array, not {}.".format(type(n))
+        raise TypeError(msg)
+    else:
+        n = np.array(n)
+        if not np.issubdtype(n.dtype, np.integer):
+            msg = "There are non-integer elements in n"
+            raise ValueError(msg)
+
+    # Check p
+    if not isinstance(p, (list, np.ndarray)):
+        msg = "p must be a list or np.array, not {}.".format(type(p))
+        raise TypeError(msg)
+    else:
+        p = np.array(p)
+        if not np.issubdtype(p.dtype, np.number):
+            msg = "There are non-numeric elements in p"
+            raise ValueError(msg)
+        elif p.shape != (n.size, n.size):
+            msg = "p is must have shape len(n) x len(n), not {}".format(p.shape)
+            raise ValueError(msg)
+        elif np.any(p < 0) or np.any(p > 1):
+            msg = "Values in p must be in between 0 and 1."
+            raise ValueError(msg)
+
+    return n, p
+
+
+def _sample_sbm_sparse_edges(n, p, directed, loops, rng):
+    """
+    Samples the edges of a binary SBM without degree correction block by block, in
+    time and memory proportional to the number of edges. Undirected graphs only get
+    the edges in their upper triangle.
+
+    Returns a list of ``(i, j, rows, cols)`` tuples, one for each block between
+    communities ``i`` and ``j``, with the vertex indices of the edges in the block.
+    """
+    K = len(n)
+    starts = np.concatenate(([0], np.cumsum(n)))
+    edges = []
+    for i in range(0, K):
+        for j in range(0, K) if directed else range(i, K):
+            rows, cols = _sample_sparse_edges(
+                n[i], n[j], p[i, j], i == j, directed, loops, rng
+            )
+            edges.append((i, j, rows + starts[i], cols + starts[j]))
+    return edges
+
+
+def _draw_block_weights(wt, wtargs, block_sizes):
+    """
+    Draws the weights of the edges of the blocks in ``block_sizes``, a list of
+    ``(i, j, n_edges)``, from ``wt[i, j]`` with the arguments ``wtargs[i, j]``.
+    Blocks that share a weight function and its arguments are drawn with a single
+    call.
+
+    Returns a list with the weights of each block.
+    """
+    groups = {}
+    for index, (i, j, _) in enumerate(block_sizes):
+        try:
+            key = (wt[i, j], tuple(sorted(wtargs[i, j].items())))
+            hash(key)
+        except TypeError:
+            # arguments like arrays are only shared if they are the same object
+            key = (wt[i, j], id(wtargs[i, j]))
+        groups.setdefault(key, []).append(index)
+
+    weights = [None] * len(block_sizes)
+    for indices in groups.values():
+        i, j, _ = block_sizes[indices[0]]
+        sizes = [block_sizes[index][2] for index in indices]
+        draws = np.asarray(wt[i, j](size=sum(sizes), **wtargs[i, j]))
+        for index, block_draws in zip(indices, np.split(draws, np.cumsum(sizes)[:-1])):
+            weights[index] = block_draws
+    return weights
+
+
+def _edges_to_csr(rows, cols, data, n_verts, directed):
+    """
+    Builds the sparse adjacency matrix of an ``n_verts`` vertex graph from its
+    edges and their weights. Undirected graphs are given by the edges in their
+    upper triangle, which are mirrored.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if not directed:
+        mirror = rows != cols
+        rows, cols = (
+            np.concatenate((rows, cols[mirror])),
+            np.concatenate((cols, rows[mirror])),
+        )
+        data = np.concatenate((data, data[mirror]))
+    A = csr_matrix((data, (rows, cols)), shape=(n_verts, n_verts))
+    A.eliminate_zeros()
+    return A
+
+
+def _sample_sbm_binary(out, n, p, directed, loops, rng):
+    """
+    Samples a binary SBM without degree correction into the square boolean array
+    ``out``, which must start out as zeros. Undirected graphs only get their upper
+    triangle sampled, and the diagonal is sampled even if not ``loops``.
+    """
+    K = len(n)
+    starts = np.concatenate(([0], np.cumsum(n)))
+    if np.all(p < _SPARSE_P):
+        # sparse binary graphs only pay for the edges they have, by drawing the
+        # number of edges in each block and then their positions
+        for _, _, rows, cols in _sample_sbm_sparse_edges(n, p, directed, loops, rng):
+            out[rows, cols] = True
+    else:
+        # drawn one community of rows at a time against that community's row of p
+        # expanded to the columns, so the full vertex probability matrix is never
+        # built; undirected graphs only sample the upper triangle
+        labels = _n_to_labels(n)
+        for i in range(0, K):
+            start = 0 if directed else starts[i]
+            _sample_bernoulli(
+                out[starts[i] : starts[i + 1], start:],
+                p[i, labels[start:]],
+                rng,
+                upper=not directed,
+            )
+    return out
+
+
+def _sample_edges_mask(P, directed, loops, rng):
+    """
+    Samples a binary graph from the edge probabilities ``P`` as a boolean matrix.
+    """
+    _check_probabilities(P)
+    # comparing uniform draws against P is much cheaper per element than
+    # binomial(1, P), and the boolean result is an eighth of the size of a float
+    # matrix until the final cast
+    A = np.full(P.shape, False)
+    # undirected graphs only sample the upper triangle
+    _sample_bernoulli(A, P, rng, upper=not directed)
+    if not directed:
+        _symmetrize_upper(A)
+
+    if not loops:
+        np.fill_diagonal(A, False)
+    return A
+
+
+def sample_edges(P, directed=False, loops=False, rng=None):
     """
     Gemerates a binary random graph based on the P matrix provided
 
@@ -33,6 +392,10 @@ def sample_edges(P, directed=False, loops=False):
     loops: boolean, optional (default=False)
         If False, no edges will be sampled in the diagonal. Otherwise, edges
         are sampled in the diagonal.
+    rng: numpy.random.Generator or numpy.random.RandomState, optional (default = None)
+        :class:`numpy.random.Generator` or :class:`numpy.random.RandomState` object to
+        sample the edges from. If None, the global numpy random state is used, so
+        ``np.random.seed`` applies.
 
     Returns
     -------
@@ -52,23 +415,13 @@ def sample_edges(P, directed=False, loops=False):
         raise ValueError("P must have dimension 2 (n_vertices, n_dimensions)")
     if P.shape[0] != P.shape[1]:
         raise ValueError("P must be a square matrix")
-    if not directed:
-        # can cut down on sampling by ~half
-        triu_inds = np.triu_indices(P.shape[0])
-        samples = np.random.binomial(1, P[triu_inds])
-        A = np.zeros_like(P)
-        A[triu_inds] = samples
-        A = symmetrize(A, method="triu")
-    else:
-        A = np.random.binomial(1, P)
+    rng = _check_rng(rng)
+    return _sample_edges_mask(P, directed, loops, rng).astype(P.dtype)
 
-    if loops:
-        return A
-    else:
-        return A - np.diag(np.diag(A))
 
-
-def er_np(n, p, directed=False, loops=False, wt=1, wtargs=None, dc=None, dc_kws={}):
+def er_np(
+    n, p, directed=False, loops=False, wt=1, wtargs=None, dc=None, dc_kws={}, rng=None
+):
     r"""
     Samples a Erdos Renyi (n, p) graph with specified edge probability.
 
@@ -123,6 +476,12 @@ def er_np(n, p, directed=False, loops=False, wt=1, wtargs=None, dc=None, dc_kws=
         If not specified, in either case all functions will assume their default
         parameters.
 
+    rng: numpy.random.Generator or numpy.random.RandomState, optional (default = None)
+        :class:`numpy.random.Generator` or :class:`numpy.random.RandomState` object to
+        sample the edges from. If None, the global numpy random state is used, so
+        ``np.random.seed`` applies.
+        The ``wt`` and ``dc`` functions draw from their own random state.
+
     Returns
     -------
     A : ndarray, shape (n, n)
@@ -149,8 +508,8 @@ def er_np(n, p, directed=False, loops=False, wt=1, wtargs=None, dc=None, dc_kws=
     >>> er_np(n, p, wt=wt, wtargs=wtargs)
     array([[0.        , 0.        , 0.95788953, 0.53316528],
            [0.        , 0.        , 0.        , 0.        ],
-           [0.95788953, 0.        , 0.        , 0.31551563],
-           [0.53316528, 0.        , 0.31551563, 0.        ]])
+           [0.95788953, 0.        , 0.        , 0.69187711],
+           [0.53316528, 0.        , 0.69187711, 0.        ]])
     """
     if isinstance(dc, (list, np.ndarray)) and all(callable(f) for f in dc):
         raise TypeError("dc is not of type function or array-like of scalars")
@@ -162,13 +521,34 @@ def er_np(n, p, directed=False, loops=False, wt=1, wtargs=None, dc=None, dc_kws=
         raise TypeError("loops is not of type bool.")
     if type(directed) is not bool:
         raise TypeError("directed is not of type bool.")
+    rng = _check_rng(rng)
+    if dc is None and wt == 1:
+        if p < 0 or p > 1:
+            msg = "Values in p must be in between 0 and 1."
+            raise ValueError(msg)
+        # a binary graph with a single edge probability needs none of the block
+        # bookkeeping in sbm, so sample it directly
+        if p < _SPARSE_P:
+            A = np.zeros((n, n), dtype=bool)
+            rows, cols = _sample_sparse_edges(n, n, p, True, directed, loops, rng)
+            A[rows, cols] = True
+            if not directed:
+                A[cols, rows] = True
+            return A.astype(np.float64)
+        A = np.full((n, n), False)
+        _sample_bernoulli(A, p, rng, upper=not directed)
+        if not directed:
+            _symmetrize_upper(A)
+        if not loops:
+            np.fill_diagonal(A, 0)
+        return A.astype(np.float64)
     n_sbm = np.array([n])
     p_sbm = np.array([[p]])
-    g = sbm(n_sbm, p_sbm, directed, loops, wt, wtargs, dc, dc_kws)
+    g = sbm(n_sbm, p_sbm, directed, loops, wt, wtargs, dc, dc_kws, rng=rng)
     return g
 
 
-def er_nm(n, m, directed=False, loops=False, wt=1, wtargs=None):
+def er_nm(n, m, directed=False, loops=False, wt=1, wtargs=None, rng=None):
     r"""
     Samples an Erdos Renyi (n, m) graph with specified number of edges.
 
@@ -203,6 +583,12 @@ def er_nm(n, m, directed=False, loops=False, wt=1, wtargs=None):
         Optional arguments for parameters that can be passed
         to weight function ``wt``.
 
+    rng: numpy.random.Generator or numpy.random.RandomState, optional (default = None)
+        :class:`numpy.random.Generator` or :class:`numpy.random.RandomState` object to
+        sample the edges from. If None, the global numpy random state is used, so
+        ``np.random.seed`` applies.
+        The ``wt`` function draws from its own random state.
+
     Returns
     -------
     A: ndarray, shape (n, n)
@@ -227,10 +613,10 @@ def er_nm(n, m, directed=False, loops=False, wt=1, wtargs=None):
     >>> wt = np.random.uniform
     >>> wtargs = dict(low=0, high=1)
     >>> er_nm(n, m, wt=wt, wtargs=wtargs)
-    array([[0.        , 0.66974604, 0.        , 0.38791074],
-           [0.66974604, 0.        , 0.        , 0.39658073],
-           [0.        , 0.        , 0.        , 0.93553907],
-           [0.38791074, 0.39658073, 0.93553907, 0.        ]])
+    array([[0.        , 0.89460666, 0.08504421, 0.03905478],
+           [0.89460666, 0.        , 0.        , 0.        ],
+           [0.08504421, 0.        , 0.        , 0.16983042],
+           [0.03905478, 0.        , 0.16983042, 0.        ]])
     """
     if not np.issubdtype(type(m), np.integer):
         raise TypeError("m is not of type int.")
@@ -251,6 +637,7 @@ def er_nm(n, m, directed=False, loops=False, wt=1, wtargs=None):
     if not np.issubdtype(type(wt), np.integer):
         if not callable(wt):
             raise TypeError("You have not passed a function for wt.")
+    rng = _check_rng(rng)
 
     # compute max number of edges to sample
     if loops:
@@ -272,33 +659,18 @@ def er_nm(n, m, directed=False, loops=False, wt=1, wtargs=None):
         msg = msg.format(m, msg, max_edges)
         raise ValueError(msg)
 
-    A = np.zeros((n, n))
-    # check if directedness is desired
-    if directed:
-        if loops:
-            # use all of the indices
-            idx = np.where(np.logical_not(A))
-        else:
-            # use only the off-diagonal indices
-            idx = np.where(~np.eye(n, dtype=bool))
-    else:
-        # use upper-triangle indices, and ignore diagonal according
-        # to loops argument
-        idx = np.triu_indices(n, k=int(loops is False))
-
-    # get idx in 1d coordinates by ravelling
-    triu = np.ravel_multi_index(idx, A.shape)
-    # choose M of them
-    triu = np.random.choice(triu, size=m, replace=False)
-    # unravel back
-    triu = np.unravel_index(triu, A.shape)
+    # choose m of the vertex pairs by their position in row-major order, which
+    # avoids building index arrays over the whole adjacency matrix
+    idx = _sample_distinct(max_edges, m, rng)
+    rows, cols = _unravel_edges(idx, n, directed, loops)
     # check weight function
     if not np.issubdtype(type(wt), np.number):
         wt = wt(size=m, **wtargs)
-    A[triu] = wt
+    A = np.full((n, n), 0.0)
+    A[rows, cols] = wt
 
     if not directed:
-        A = symmetrize(A, method="triu")
+        _symmetrize_upper(A)
 
     return A
 
@@ -313,6 +685,8 @@ def sbm(
     dc=None,
     dc_kws={},
     return_labels=False,
+    rng=None,
+    sparse=False,
 ):
     """
     Samples a graph from the stochastic block model (SBM).
@@ -386,6 +760,19 @@ def sbm(
         be an array with length equal to the number of vertices in the graph, where each
         entry in the array labels which block a vertex in the graph is in.
 
+    rng: numpy.random.Generator or numpy.random.RandomState, optional (default = None)
+        :class:`numpy.random.Generator` or :class:`numpy.random.RandomState` object to
+        sample the edges from. If None, the global numpy random state is used, so
+        ``np.random.seed`` applies.
+        The ``wt`` and ``dc`` functions draw from their own random state.
+
+    sparse: boolean, optional (default=False)
+        If True, the adjacency matrix is returned as a
+        :class:`scipy.sparse.csr_matrix`, and only the sampled edges are ever
+        stored, so graphs too large for a dense matrix can be sampled. Only
+        supported if ``dc`` is None. The edges are sampled block by block in time
+        proportional to their number, so this is intended for small ``p``.
+
     References
     ----------
     .. [1] Tai Qin and Karl Rohe. "Regularized spectral clustering under the
@@ -394,7 +781,7 @@ def sbm(
 
     Returns
     -------
-    A: ndarray, shape (sum(n), sum(n))
+    A: ndarray or scipy.sparse.csr_matrix, shape (sum(n), sum(n))
         Sampled adjacency matrix
     labels: ndarray, shape (sum(n))
         Label vector
@@ -408,53 +795,31 @@ def sbm(
     To sample a binary 2-block SBM graph:
 
     >>> sbm(n, p)
-    array([[0., 0., 1., 0., 0., 0.],
-           [0., 0., 1., 0., 0., 1.],
+    array([[0., 0., 1., 0., 0., 1.],
+           [0., 0., 1., 0., 0., 0.],
            [1., 1., 0., 0., 0., 0.],
            [0., 0., 0., 0., 1., 0.],
            [0., 0., 0., 1., 0., 0.],
-           [0., 1., 0., 0., 0., 0.]])
+           [1., 0., 0., 0., 0., 0.]])
 
     To sample a weighted 2-block SBM graph with Poisson(2) distribution:
 
     >>> wt = np.random.poisson
     >>> wtargs = dict(lam=2)
     >>> sbm(n, p, wt=wt, wtargs=wtargs)
-    array([[0., 4., 0., 1., 0., 0.],
-           [4., 0., 0., 0., 0., 2.],
-           [0., 0., 0., 0., 0., 0.],
+    array([[0., 1., 0., 1., 0., 0.],
+           [1., 0., 2., 0., 0., 2.],
+           [0., 2., 0., 0., 0., 0.],
            [1., 0., 0., 0., 0., 0.],
-           [0., 0., 0., 0., 0., 0.],
-           [0., 2., 0., 0., 0., 0.]])
+           [0., 0., 0., 0., 0., 4.],
+           [0., 2., 0., 0., 4., 0.]])
     """
-    # Check n
-    if not isinstance(n, (list, np.ndarray)):
-        msg = "n must be a list or np.array, not {}.".format(type(n))
-        raise TypeError(msg)
-    else:
-        n = np.array(n)
-        if not np.issubdtype(n.dtype, np.integer):
-            msg = "There are non-integer elements in n"
-            raise ValueError(msg)
-
-    # Check p
-    if not isinstance(p, (list, np.ndarray)):
-        msg = "p must be a list or np.array, not {}.".format(type(p))
-        raise TypeError(msg)
-    else:
-        p = np.array(p)
-        if not np.issubdtype(p.dtype, np.number):
-            msg = "There are non-numeric elements in p"
-            raise ValueError(msg)
-        elif p.shape != (n.size, n.size):
-            msg = "p is must have shape len(n) x len(n), not {}".format(p.shape)
-            raise ValueError(msg)
-        elif np.any(p < 0) or np.any(p > 1):
-            msg = "Values in p must be in between 0 and 1."
-            raise ValueError(msg)
+    n, p = _check_n_p(n, p)
 
     # Check wt and wtargs
-    if not np.issubdtype(type(wt), np.number) and not callable(wt):
+    # a single weight function or constant is used as is for every block
+    block_wts = not np.issubdtype(type(wt), np.number) and not callable(wt)
+    if block_wts:
         if not isinstance(wt, (list, np.ndarray)):
             msg = "wt must be a numeric, list, or np.array, not {}".format(type(wt))
             raise TypeError(msg)
@@ -478,26 +843,25 @@ def sbm(
             if not callable(element):
                 msg = "{} is not a callable function.".format(element)
                 raise TypeError(msg)
-    else:
-        wt = np.full(p.shape, wt, dtype=object)
-        wtargs = np.full(p.shape, wtargs, dtype=object)
 
     # Check directed
     if not directed:
         if np.any(p != p.T):
             raise ValueError("Specified undirected, but P is directed.")
-        if np.any(wt != wt.T):
+        if block_wts and np.any(wt != wt.T):
             raise ValueError("Specified undirected, but Wt is directed.")
-        if np.any(wtargs != wtargs.T):
+        if block_wts and np.any(wtargs != wtargs.T):
             raise ValueError("Specified undirected, but Wtargs is directed.")
 
+    rng = _check_rng(rng)
+
     K = len(n)  # the number of communities
-    counter = 0
-    # get a list of community indices
-    cmties = []
-    for i in range(0, K):
-        cmties.append(range(counter, counter + n[i]))
-        counter += n[i]
+    # communities are contiguous, so each is a slice of the vertices and
+    # indexing with it gives a view instead of a copy
+    offsets = np.concatenate([[0], np.cumsum(n)])
+    cmties = [slice(offsets[i], offsets[i + 1]) for i in range(0, K)]
+
+    labels = _n_to_labels(n)
 
     # Check degree-corrected input parameters
     if callable(dc):
@@ -506,9 +870,8 @@ def sbm(
             msg = "dc_kws must be of type dict not{}".format(type(dc_kws))
             raise TypeError(msg)
         # Create the probability matrix for each vertex
-        dcProbs = np.array([dc(**dc_kws) for _ in range(0, sum(n))], dtype="float")
-        for indices in cmties:
-            dcProbs[indices] /= sum(dcProbs[indices])
+        dcProbs = _sample_dc(dc, dc_kws, sum(n))
+        dcProbs /= np.bincount(labels, weights=dcProbs, minlength=K)[labels]
     elif isinstance(dc, (list, np.ndarray)) and np.issubdtype(
         np.array(dc).dtype, np.number
     ):
@@ -525,11 +888,12 @@ def sbm(
             msg = "Values in dc cannot be negative."
             raise ValueError(msg)
         # Check that probabilities sum to 1 in each block
-        for i in range(0, K):
-            if not np.isclose(sum(dcProbs[cmties[i]]), 1, atol=1.0e-8):
-                msg = "Block {} probabilities should sum to 1, normalizing...".format(i)
-                warnings.warn(msg, UserWarning)
-                dcProbs[cmties[i]] /= sum(dcProbs[cmties[i]])
+        block_sums = np.bincount(labels, weights=dcProbs, minlength=K)
+        unnormalized = ~np.isclose(block_sums, 1, atol=1.0e-8)
+        for i in np.flatnonzero(unnormalized):
+            msg = "Block {} probabilities should sum to 1, normalizing...".format(i)
+            warnings.warn(msg, UserWarning)
+        dcProbs /= np.where(unnormalized, block_sums, 1)[labels]
     elif isinstance(dc, (list, np.ndarray)) and all(callable(f) for f in dc):
         dcFuncs = np.array(dc)
         if dcFuncs.shape != (len(n),):
@@ -555,73 +919,198 @@ def sbm(
             msg = "dc_kws elements must all be of type dict"
             raise TypeError(msg)
         # Create the probability matrix for each vertex
-        dcProbs = np.array(
+        dcProbs = np.concatenate(
             [
-                dcFunc(**kws)
+                _sample_dc(dcFunc, kws, size)
                 for dcFunc, kws, size in zip(dcFuncs, dc_kws, n)
-                for _ in range(0, size)
-            ],
-            dtype="float",
+            ]
         )
-        # dcProbs = dcProbs.astype(float)
-        for indices in cmties:
-            dcProbs[indices] /= sum(dcProbs[indices])
-            # dcProbs[indices] = dcProbs / dcProbs[indices].sum()
+        dcProbs /= np.bincount(labels, weights=dcProbs, minlength=K)[labels]
     elif dc is not None:
         msg = "dc must be a function or a list or np.array of numbers or callable"
         msg += " functions, not {}".format(type(dc))
         raise ValueError(msg)
 
-    # End Checks, begin simulation
-    A = np.zeros((sum(n), sum(n)))
+    if sparse and dc is not None:
+        raise ValueError("sparse output is not supported for degree-corrected SBMs.")
 
-    for i in range(0, K):
-        if directed:
-            jrange = range(0, K)
+    # End Checks, begin simulation
+    if sparse:
+        edges = _sample_sbm_sparse_edges(n, p, directed, loops, rng)
+        rows = np.concatenate([block_rows for _, _, block_rows, _ in edges])
+        cols = np.concatenate([block_cols for _, _, _, block_cols in edges])
+        if block_wts:
+            block_sizes = [(i, j, len(block_rows)) for i, j, block_rows, _ in edges]
+            data = np.concatenate(_draw_block_weights(wt, wtargs, block_sizes))
+        elif callable(wt):
+            data = wt(size=len(rows), **wtargs)
         else:
-            jrange = range(i, K)
-        for j in jrange:
-            block_wt = wt[i, j]
-            block_wtargs = wtargs[i, j]
-            block_p = p[i, j]
-            # identify submatrix for community i, j
-            # cartesian product to identify edges for community i,j pair
-            cprod = cartesian_product(cmties[i], cmties[j])
-            # get idx in 1d coordinates by ravelling
-            triu = np.ravel_multi_index((cprod[:, 0], cprod[:, 1]), A.shape)
-            pchoice = np.random.uniform(size=len(triu))
-            if dc is not None:
-                # (v1,v2) connected with probability p*k_i*k_j*dcP[v1]*dcP[v2]
-                num_edges = sum(pchoice < block_p)
-                edge_dist = dcProbs[cprod[:, 0]] * dcProbs[cprod[:, 1]]
-                # If n_edges greater than support of dc distribution, pick fewer edges
-                if num_edges > sum(edge_dist > 0):
+            data = np.full(len(rows), wt)
+        A = _edges_to_csr(rows, cols, data, sum(n), directed)
+    elif dc is None:
+        A = np.full((sum(n), sum(n)), False)
+        _sample_sbm_binary(A, n, p, directed, loops, rng)
+        if block_wts or callable(wt) or wt != 1:
+            if not loops:
+                np.fill_diagonal(A, False)
+            edges = A
+            A = np.full((sum(n), sum(n)), 0.0)
+            if block_wts:
+                # the weights of all blocks sharing a weight function are drawn
+                # at once
+                blocks = []
+                block_sizes = []
+                for i in range(0, K):
+                    for j in range(0, K) if directed else range(i, K):
+                        block = (cmties[i], cmties[j])
+                        blocks.append(block)
+                        block_sizes.append((i, j, np.count_nonzero(edges[block])))
+                weights = _draw_block_weights(wt, wtargs, block_sizes)
+                for block, block_weights in zip(blocks, weights):
+                    A[block][edges[block]] = block_weights
+            elif callable(wt):
+                # a single weight function covers every block, so the weights of
+                # all edges are drawn at once
+                A[edges] = wt(size=np.count_nonzero(edges), **wtargs)
+            else:
+                A[edges] = wt
+    else:
+        # degree-corrected blocks place a binomial number of edges in proportion
+        # to the degree corrections of their vertices
+        A = np.full((sum(n), sum(n)), 0.0)
+        for i in range(0, K):
+            if directed:
+                jrange = range(0, K)
+            else:
+                jrange = range(i, K)
+            for j in jrange:
+                if block_wts:
+                    block_wt = wt[i, j]
+                    block_wtargs = wtargs[i, j]
+                else:
+                    block_wt = wt
+                    block_wtargs = wtargs
+                block_p = p[i, j]
+                # the submatrix of A between communities i and j
+                block = A[cmties[i], cmties[j]]
+                # (v1,v2) connected with probability p*k_i*k_j*dcP[v1]*dcP[v2]; only
+                # the number of edges is drawn with probability p, so it is drawn
+                # directly instead of testing every pair of vertices
+                num_edges = rng.binomial(block.size, block_p)
+                edge_dist = np.outer(dcProbs[cmties[i]], dcProbs[cmties[j]]).ravel()
+                # If n_edges greater than support of dc distribution,
+                # pick fewer edges
+                support = np.count_nonzero(edge_dist)
+                if num_edges > support:
                     msg = "More edges sampled than nonzero pairwise dc entries."
                     msg += " Picking fewer edges"
                     warnings.warn(msg, UserWarning)
-                    num_edges = sum(edge_dist > 0)
-                triu = np.random.choice(
-                    triu, size=num_edges, replace=False, p=edge_dist
-                )
-            else:
-                # connected with probability p
-                triu = triu[pchoice < block_p]
-            if type(block_wt) is not int:
-                block_wt = block_wt(size=len(triu), **block_wtargs)
-            triu = np.unravel_index(triu, A.shape)
-            A[triu] = block_wt
-
-    if not loops:
-        A = A - np.diag(np.diag(A))
-    if not directed:
-        A = symmetrize(A, method="triu")
+                    num_edges = support
+                edges = _sample_weighted(edge_dist, num_edges, rng)
+                edges = np.unravel_index(edges, block.shape)
+                if callable(block_wt):
+                    block_wt = block_wt(size=num_edges, **block_wtargs)
+                block[edges] = block_wt
+        if not directed:
+            # the diagonal blocks were sampled in full
+            A = np.triu(A)
+
+    if not sparse:
+        if not loops:
+            np.fill_diagonal(A, 0)
+        if not directed:
+            _symmetrize_upper(A)
+        # binary graphs are sampled as boolean matrices
+        A = A.astype(np.float64, copy=False)
     if return_labels:
-        labels = _n_to_labels(n)
         return A, labels
     return A
 
 
-def rdpg(X, Y=None, rescale=False, directed=False, loops=False, wt=1, wtargs=None):
+def sbm_batch(n, p, n_samples, directed=False, loops=False, rng=None):
+    """
+    Samples several binary graphs from the same stochastic block model (SBM).
+
+    Equivalent to calling :func:`sbm` ``n_samples`` times with the same ``n`` and
+    ``p``, but the inputs are only validated once and the graphs are sampled
+    straight into one stacked array.
+
+    Parameters
+    ----------
+    n: list of int, shape (n_communities)
+        Number of vertices in each community. Communities are assigned n[0], n[1], ...
+
+    p: array-like, shape (n_communities, n_communities)
+        Probability of an edge between each of the communities, where ``p[i, j]`` indicates
+        the probability of a connection between edges in communities ``[i, j]``.
+        ``0 < p[i, j] < 1`` for all ``i, j``.
+
+    n_samples: int
+        Number of graphs to sample.
+
+    directed: boolean, optional (default=False)
+        If False, output adjacency matrices will be symmetric. Otherwise, output
+        adjacency matrices will be asymmetric.
+
+    loops: boolean, optional (default=False)
+        If False, no edges will be sampled in the diagonal. Otherwise, edges
+        are sampled in the diagonal.
+
+    rng: numpy.random.Generator or numpy.random.RandomState, optional (default = None)
+        :class:`numpy.random.Generator` or :class:`numpy.random.RandomState` object to
+        sample the edges from. If None, the global numpy random state is used, so
+        ``np.random.seed`` applies.
+
+    Returns
+    -------
+    A: ndarray, shape (n_samples, sum(n), sum(n))
+        Sampled adjacency matrices
+
+    See also
+    --------
+    graspologic.simulations.sbm
+
+    Examples
+    --------
+    >>> rng = np.random.default_rng(5)
+    >>> n = [2, 2]
+    >>> p = [[0.5, 0.1], [0.1, 0.5]]
+    >>> sbm_batch(n, p, 2, rng=rng)
+    array([[[0., 0., 0., 0.],
+            [0., 0., 0., 1.],
+            [0., 0., 0., 0.],
+            [0., 1., 0., 0.]],
+    <BLANKLINE>
+           [[0., 0., 0., 0.],
+            [0., 0., 0., 1.],
+            [0., 0., 0., 1.],
+            [0., 1., 1., 0.]]])
+    """
+    n, p = _check_n_p(n, p)
+    check_scalar(
+        x=n_samples, name="n_samples", target_type=(int, np.integer), min_val=1
+    )
+    if type(directed) is not bool:
+        raise TypeError("directed is not of type bool.")
+    if type(loops) is not bool:
+        raise TypeError("loops is not of type bool.")
+    if not directed and np.any(p != p.T):
+        raise ValueError("Specified undirected, but P is directed.")
+    rng = _check_rng(rng)
+
+    A = np.full((n_samples, sum(n), sum(n)), False)
+    for graph in A:
+        _sample_sbm_binary(graph, n, p, directed, loops, rng)
+        if not loops:
+            np.fill_diagonal(graph, False)
+        if not directed:
+            _symmetrize_upper(graph)
+    return A.astype(np.float64)
+
+
+def rdpg(
+    X, Y=None, rescale=False, directed=False, loops=False, wt=1, wtargs=None, rng=None
+):
     r"""
     Samples a random graph based on the latent positions in X (and
     optionally in Y)
@@ -672,6 +1161,12 @@ def rdpg(X, Y=None, rescale=False, directed=False, loops=False, wt=1, wtargs=Non
         Optional arguments for parameters that can be passed
         to weight function ``wt``.
 
+    rng: numpy.random.Generator or numpy.random.RandomState, optional (default = None)
+        :class:`numpy.random.Generator` or :class:`numpy.random.RandomState` object to
+        sample the edges from. If None, the global numpy random state is used, so
+        ``np.random.seed`` applies.
+        The ``wt`` function draws from its own random state.
+
     Returns
     -------
     A: ndarray (n_vertices, n_vertices)
@@ -695,26 +1190,23 @@ def rdpg(X, Y=None, rescale=False, directed=False, loops=False, wt=1, wtargs=Non
     Sample a binary RDPG using sampled latent positions.
 
     >>> rdpg(X, loops=False)
-    array([[0., 1., 0., 0., 1.],
+    array([[0., 1., 1., 0., 1.],
            [1., 0., 0., 1., 1.],
-           [0., 0., 0., 1., 1.],
-           [0., 1., 1., 0., 0.],
-           [1., 1., 1., 0., 0.]])
+           [1., 0., 0., 0., 0.],
+           [0., 1., 0., 0., 0.],
+           [1., 1., 0., 0., 0.]])
 
     Sample a weighted RDPG with Poisson(2) weight distribution
 
     >>> wt = np.random.poisson
     >>> wtargs = dict(lam=2)
     >>> rdpg(X, loops=False, wt=wt, wtargs=wtargs)
-    array([[0., 4., 0., 2., 0.],
-           [1., 0., 0., 0., 0.],
-           [0., 0., 0., 0., 2.],
-           [1., 0., 0., 0., 1.],
-           [0., 2., 2., 0., 0.]])
+    array([[0., 0., 0., 2., 0.],
+           [0., 0., 4., 0., 1.],
+           [0., 1., 0., 1., 5.],
+           [2., 0., 5., 0., 3.],
+           [0., 2., 0., 2., 0.]])
     """
-    P = p_from_latent(X, Y, rescale=rescale, loops=loops)
-    A = sample_edges(P, directed=directed, loops=loops)
-
     # check weight function
     if (not np.issubdtype(type(wt), np.integer)) and (
         not np.issubdtype(type(wt), np.floating)
@@ -722,10 +1214,16 @@ def rdpg(X, Y=None, rescale=False, directed=False, loops=False, wt=1, wtargs=Non
         if not callable(wt):
             raise TypeError("You have not passed a function for wt.")
 
+    P = p_from_latent(X, Y, rescale=rescale, loops=loops)
+    rng = _check_rng(rng)
+    # the sampled edges are kept as a boolean mask to place the weights with
+    edges = _sample_edges_mask(P, directed, loops, rng)
+
     if not np.issubdtype(type(wt), np.number):
-        wts = wt(size=(np.count_nonzero(A)), **wtargs)
-        A[A > 0] = wts
+        A = np.full(P.shape, 0, dtype=P.dtype)
+        A[edges] = wt(size=np.count_nonzero(edges), **wtargs)
     else:
+        A = edges.astype(P.dtype)
         A *= wt
     return A
 
@@ -768,7 +1266,10 @@ def p_from_latent(X, Y=None, rescale=False, loops=True):
     -------
     P: ndarray (n_vertices, n_vertices)
         A matrix representing the probabilities of connections between
-        vertices in a random graph based on their latent positions
+        vertices in a random graph based on their latent positions. It has the
+        dtype of ``X`` and ``Y``, so passing ``float32`` latent positions halves
+        the memory of P and the time to compute it, at a precision that is
+        plenty for edge probabilities
 
     References
     ----------
@@ -787,18 +1288,30 @@ def p_from_latent(X, Y=None, rescale=False, loops=True):
         )
     if X.shape != Y.shape:
         raise ValueError("Dimensions of latent positions X and Y must be the same")
-    P = X @ Y.T
+    if X.shape[1] > _PANEL_MAX_DIM:
+        P = X @ Y.T
+        if not rescale:
+            np.clip(P, 0, 1, out=P)
+    else:
+        # with few latent dimensions the product is bound by writing P, so it is
+        # computed a panel of rows at a time and clipped while still in cache
+        P = np.empty((X.shape[0], Y.shape[0]), dtype=np.result_type(X, Y))
+        for start in range(0, X.shape[0], _PANEL_ROWS):
+            panel = P[start : start + _PANEL_ROWS]
+            np.matmul(X[start : start + _PANEL_ROWS], Y.T, out=panel)
+            if not rescale:
+                np.clip(panel, 0, 1, out=panel)
     # should this be before or after the rescaling, could give diff answers
     if not loops:
-        P = P - np.diag(np.diag(P))
+        np.fill_diagonal(P, 0)
+    # P is a new array, so it is rescaled in place
     if rescale:
+        if not np.issubdtype(P.dtype, np.floating):
+            P = P.astype(np.float64)
         if P.min() < 0:
-            P = P - P.min()
+            P -= P.min()
         if P.max() > 1:
-            P = P / P.max()
-    else:
-        P[P < 0] = 0
-        P[P > 1] = 1
+            P /= P.max()
     return P
 
 
@@ -900,8 +1413,8 @@ def mmsbm(
     >>> np.random.seed(1)
     >>> alpha = [0.05, 0.05]
     >>> mmsbm(n, p, alpha, rng = rng)
-    array([[0., 1., 0., 0., 0., 0.],
-           [1., 0., 0., 0., 0., 0.],
+    array([[0., 0., 0., 0., 0., 0.],
+           [0., 0., 0., 0., 0., 0.],
            [0., 0., 0., 0., 0., 0.],
            [0., 0., 0., 0., 1., 1.],
            [0., 0., 0., 1., 0., 1.],
@@ -936,13 +1449,13 @@ def mmsbm(
         )
         raise ValueError(msg)
 
-    if not isinstance(rng, (np.random._generator.Generator)):
+    if rng is None:
+        rng = np.random.default_rng()
+    elif not isinstance(rng, (np.random._generator.Generator)):
         msg = "rng must be <class 'numpy.random._generator.Generator'> not {}.".format(
             type(rng)
         )
         raise TypeError(msg)
-    elif rng == None:
-        rng = np.random.default_rng()
 
     if type(loops) is not bool:
         raise TypeError("loops is not of type bool.")
@@ -973,7 +1486,7 @@ def mmsbm(
 
     P = p[(labels, labels.T)]
 
-    A = sample_edges(P, directed=directed, loops=loops)
+    A = sample_edges(P, directed=directed, loops=loops, rng=rng)
 
     if not loops:
         np.fill_diagonal(labels, -1)
@@ -2,7 +2,16 @@
 # Licensed under the MIT License.
 
 import numpy as np
-from graspologic.simulations import sample_edges
+from graspologic.simulations.simulations import (
+    _DRAW_CHUNK,
+    _check_probabilities,
+    _check_rng,
+    _edges_to_csr,
+    _n_to_labels,
+    _sample_bernoulli,
+    _sample_sbm_sparse_edges,
+    _symmetrize_upper,
+)
 
 
 def check_dirloop(directed, loops):
@@ -42,6 +51,59 @@ def check_rel_sbm(p, r):
                 raise ValueError(msg)
 
 
+def _check_corr_probabilities(P, R):
+    """
+    Raises a ValueError unless the correlations ``R`` are between -1 and 1 and the
+    edge probabilities of the second graph given the first are between 0 and 1:
+    ``P + R * (1 - P)`` where the first graph can have an edge, and ``P * (1 - R)``
+    where it can lack one. Checked a few rows at a time.
+    """
+    # NaN fails both comparisons
+    if R.size and not (R.min() >= -1 and R.max() <= 1):
+        msg = "Values in R must be in between -1 and 1."
+        raise ValueError(msg)
+    step = max(1, _DRAW_CHUNK // max(P.shape[1], 1))
+    for start in range(0, P.shape[0], step):
+        p = P[start : start + step]
+        r = R[start : start + step]
+        _check_probabilities(np.where(p > 0, p + r * (1 - p), 0), "P + R * (1 - P)")
+        _check_probabilities(np.where(p < 1, p * (1 - r), 0), "P * (1 - R)")
+
+
+def _sample_sbm_corr_sparse(n, p, r, directed, loops):
+    """
+    Samples a pair of correlated binary SBMs as sparse matrices, in time and memory
+    proportional to their number of edges.
+    """
+    rng = _check_rng(None)
+    n_verts = np.sum(n)
+    labels = _n_to_labels(n)
+
+    def concatenate_edges(edges):
+        rows = np.concatenate([block_rows for _, _, block_rows, _ in edges])
+        cols = np.concatenate([block_cols for _, _, _, block_cols in edges])
+        return rows, cols
+
+    rows1, cols1 = concatenate_edges(
+        _sample_sbm_sparse_edges(n, p, directed, loops, rng)
+    )
+    # G2 keeps each edge of G1 with probability p + r * (1 - p), and has each other
+    # pair of vertices as an edge with probability p * (1 - r); the latter are
+    # drawn for every pair, dropping those that are edges of G1
+    edge_p = p[labels[rows1], labels[cols1]]
+    kept = rng.random(len(rows1)) < edge_p + r * (1 - edge_p)
+    rows_new, cols_new = concatenate_edges(
+        _sample_sbm_sparse_edges(n, p * (1 - r), directed, loops, rng)
+    )
+    new = ~np.isin(rows_new * n_verts + cols_new, rows1 * n_verts + cols1)
+    rows2 = np.concatenate((rows1[kept], rows_new[new]))
+    cols2 = np.concatenate((cols1[kept], cols_new[new]))
+
+    G1 = _edges_to_csr(rows1, cols1, np.ones(len(rows1)), n_verts, directed)
+    G2 = _edges_to_csr(rows2, cols2, np.ones(len(rows2)), n_verts, directed)
+    return G1, G2
+
+
 def sample_edges_corr(P, R, directed=False, loops=False):
     """
     Generate a pair of correlated graphs with Bernoulli distribution.
@@ -53,7 +115,7 @@ def sample_edges_corr(P, R, directed=False, loops=False):
         Matrix of probabilities (between 0 and 1) for a random graph.
 
     R: np.ndarray, shape (n_vertices, n_vertices)
-        Matrix of correlation (between 0 and 1) between graph pairs.
+        Matrix of correlation (between -1 and 1) between graph pairs.
 
     directed: boolean, optional (default=False)
         If False, output adjacency matrix will be symmetric. Otherwise, output adjacency
@@ -87,15 +149,15 @@ def sample_edges_corr(P, R, directed=False, loops=False):
     To sample a correlated graph pair based on P and R matrices:
 
     >>> sample_edges_corr(P, R, directed = False, loops = False)
-    (array([[0., 1., 0., 0., 0.],
-            [1., 0., 0., 0., 0.],
-            [0., 0., 0., 0., 1.],
-            [0., 0., 0., 0., 1.],
-            [0., 0., 1., 1., 0.]]), array([[0., 1., 0., 0., 0.],
-            [1., 0., 1., 0., 1.],
-            [0., 1., 0., 1., 1.],
-            [0., 0., 1., 0., 1.],
-            [0., 1., 1., 1., 0.]]))
+    (array([[0., 0., 1., 1., 1.],
+           [0., 0., 1., 1., 0.],
+           [1., 1., 0., 0., 1.],
+           [1., 1., 0., 0., 1.],
+           [1., 0., 1., 1., 0.]]), array([[0., 1., 1., 1., 0.],
+           [1., 0., 0., 1., 0.],
+           [1., 0., 0., 1., 0.],
+           [1., 1., 1., 0., 1.],
+           [0., 0., 0., 1., 0.]]))
     """
     # test input
     # check P
@@ -114,17 +176,41 @@ def sample_edges_corr(P, R, directed=False, loops=False):
     if R.shape[0] != P.shape[1]:
         raise ValueError("R must be a square matrix")
 
+    # check the probabilities and correlations
+    _check_probabilities(P)
+    _check_corr_probabilities(P, R)
+
     # check directed and loops
     check_dirloop(directed, loops)
 
-    G1 = sample_edges(P, directed=directed, loops=loops)
-    P2 = G1.copy()
-    P2 = np.where(P2 == 1, P + R * (1 - P), P * (1 - R))
-    G2 = sample_edges(P2, directed=directed, loops=loops)
+    rng = _check_rng(None)
+    G1 = np.full(P.shape, False)
+    G2 = np.full(P.shape, False)
+    # both graphs are drawn a few rows at a time, so that the edge probabilities
+    # of G2 given G1 are only ever computed for the rows in the chunk; undirected
+    # graphs only sample the upper triangle
+    n_verts = P.shape[0]
+    step = max(1, _DRAW_CHUNK // max(n_verts, 1))
+    for start in range(0, n_verts, step):
+        chunk = (slice(start, start + step), slice(0 if directed else start, None))
+        _sample_bernoulli(G1[chunk], P[chunk], rng, upper=not directed)
+        # the edge probabilities of G2 are P + R * (1 - P) where G1 has an edge
+        # and P * (1 - R) elsewhere, which is P + (G1 - P) * R since G1 is binary
+        P2 = G1[chunk] - P[chunk]
+        P2 *= R[chunk]
+        P2 += P[chunk]
+        _sample_bernoulli(G2[chunk], P2, rng, upper=not directed)
+    for G in (G1, G2):
+        if not directed:
+            _symmetrize_upper(G)
+        if not loops:
+            np.fill_diagonal(G, False)
+    G1 = G1.astype(P.dtype)
+    G2 = G2.astype(P.dtype)
     return G1, G2
 
 
-def er_corr(n, p, r, directed=False, loops=False):
+def er_corr(n, p, r, directed=False, loops=False, sparse=False):
     """
     Generate a pair of correlated graphs with specified edge probability
     Both G1 and G2 are binary matrices.
@@ -148,12 +234,18 @@ def er_corr(n, p, r, directed=False, loops=False):
         If False, no edges will be sampled in the diagonal. Otherwise, edges
         are sampled in the diagonal.
 
+    sparse: boolean, optional (default=False)
+        If True, the adjacency matrices are returned as
+        :class:`scipy.sparse.csr_matrix`, and only the sampled edges are ever
+        stored. The edges are sampled in time proportional to their number, so
+        this is intended for small ``p``.
+
     Returns
     -------
-    G1: ndarray (n_vertices, n_vertices)
+    G1: ndarray or scipy.sparse.csr_matrix (n_vertices, n_vertices)
         Adjacency matrix the same size as P representing a random graph.
 
-    G2: ndarray (n_vertices, n_vertices)
+    G2: ndarray or scipy.sparse.csr_matrix (n_vertices, n_vertices)
         Adjacency matrix the same size as P representing a random graph.
 
     Examples
@@ -166,15 +258,15 @@ def er_corr(n, p, r, directed=False, loops=False):
     To sample a correlated ER graph pair based on n, p and r:
 
     >>> er_corr(n, p, r, directed=False, loops=False)
-    (array([[0., 0., 1., 0., 0.],
-        [0., 0., 0., 1., 0.],
-        [1., 0., 0., 1., 1.],
-        [0., 1., 1., 0., 1.],
-        [0., 0., 1., 1., 0.]]), array([[0., 1., 1., 1., 0.],
-        [1., 0., 0., 1., 0.],
-        [1., 0., 0., 1., 1.],
-        [1., 1., 1., 0., 1.],
-        [0., 0., 1., 1., 0.]]))
+    (array([[0., 1., 0., 1., 1.],
+           [1., 0., 0., 1., 1.],
+           [0., 0., 0., 0., 1.],
+           [1., 1., 0., 0., 1.],
+           [1., 1., 1., 1., 0.]]), array([[0., 1., 1., 1., 1.],
+           [1., 0., 0., 1., 1.],
+           [1., 0., 0., 1., 0.],
+           [1., 1., 1., 0., 1.],
+           [1., 1., 0., 1., 0.]]))
     """
     # test input
     # check n
@@ -200,13 +292,18 @@ def er_corr(n, p, r, directed=False, loops=False):
     # check directed and loops
     check_dirloop(directed, loops)
 
+    if sparse:
+        return _sample_sbm_corr_sparse(
+            np.array([n]), np.array([[p]]), r, directed, loops
+        )
+
     P = p * np.ones((n, n))
     R = r * np.ones((n, n))
     G1, G2 = sample_edges_corr(P, R, directed=directed, loops=loops)
     return G1, G2
 
 
-def sbm_corr(n, p, r, directed=False, loops=False):
+def sbm_corr(n, p, r, directed=False, loops=False, sparse=False):
     """
     Generate a pair of correlated graphs with specified edge probability
     Both G1 and G2 are binary matrices.
@@ -232,12 +329,18 @@ def sbm_corr(n, p, r, directed=False, loops=False):
         If False, no edges will be sampled in the diagonal. Otherwise, edges
         are sampled in the diagonal.
 
+    sparse: boolean, optional (default=False)
+        If True, the adjacency matrices are returned as
+        :class:`scipy.sparse.csr_matrix`, and only the sampled edges are ever
+        stored. The edges are sampled in time proportional to their number, so
+        this is intended for small ``p``.
+
     Returns
     -------
-    G1: ndarray (n_vertices, n_vertices)
+    G1: ndarray or scipy.sparse.csr_matrix (n_vertices, n_vertices)
         Adjacency matrix the same size as P representing a random graph.
 
-    G2: ndarray (n_vertices, n_vertices)
+    G2: ndarray or scipy.sparse.csr_matrix (n_vertices, n_vertices)
         Adjacency matrix the same size as P representing a random graph.
 
     Examples
@@ -250,17 +353,17 @@ def sbm_corr(n, p, r, directed=False, loops=False):
     To sample a correlated SBM graph pair based on n, p and r:
 
     >>> sbm_corr(n, p, r, directed=False, loops=False)
-    (array([[0., 1., 0., 0., 0., 0.],
-        [1., 0., 0., 0., 0., 0.],
-        [0., 0., 0., 0., 0., 0.],
-        [0., 0., 0., 0., 0., 1.],
-        [0., 0., 0., 0., 0., 0.],
-        [0., 0., 0., 1., 0., 0.]]), array([[0., 1., 0., 0., 0., 0.],
-        [1., 0., 0., 1., 1., 0.],
-        [0., 0., 0., 0., 0., 0.],
-        [0., 1., 0., 0., 0., 1.],
-        [0., 1., 0., 0., 0., 0.],
-        [0., 0., 0., 1., 0., 0.]]))
+    (array([[0., 0., 1., 0., 0., 0.],
+           [0., 0., 1., 0., 1., 0.],
+           [1., 1., 0., 0., 1., 0.],
+           [0., 0., 0., 0., 1., 1.],
+           [0., 1., 1., 1., 0., 0.],
+           [0., 0., 0., 1., 0., 0.]]), array([[0., 0., 1., 0., 0., 0.],
+           [0., 0., 1., 0., 0., 0.],
+           [1., 1., 0., 0., 0., 0.],
+           [0., 0., 0., 0., 0., 0.],
+           [0., 0., 0., 0., 0., 0.],
+           [0., 0., 0., 0., 0., 0.]]))
     """
     # test input
     # Check n
@@ -298,6 +401,9 @@ def sbm_corr(n, p, r, directed=False, loops=False):
     # check directed and loops
     check_dirloop(directed, loops)
 
+    if sparse:
+        return _sample_sbm_corr_sparse(n, p, r, directed, loops)
+
     P = np.zeros((np.sum(n), np.sum(n)))
     block_indices = np.insert(np.cumsum(np.array(n)), 0, 0)
     for i in range(np.array(p).shape[0]):  # for each row
@@ -278,8 +278,13 @@ def symmetrize(graph, method="avg"):
         msg = "You have not passed a valid parameter for the method."
         raise ValueError(msg)
 
-    dia = diags(graph.diagonal()) if sparse else np.diag(np.diag(graph))
-    graph = graph + graph.T - dia
+    if sparse:
+        graph = graph + graph.T - diags(graph.diagonal())
+    else:
+        # restore the diagonal, which the sum counted twice
+        out = graph + graph.T
+        np.fill_diagonal(out, graph.diagonal())
+        graph = out
     return graph
 
 
@@ -300,9 +305,11 @@ def remove_loops(graph):
     """
     graph = import_graph(graph)
 
-    dia = diags(graph.diagonal()) if isspmatrix_csr(graph) else np.diag(np.diag(graph))
-
-    graph = graph - dia
+    if isspmatrix_csr(graph):
+        graph = graph - diags(graph.diagonal())
+    else:
+        # import_graph returns a copy, so the diagonal is cleared in place
+        np.fill_diagonal(graph, 0)
 
     return graph
 
@@ -0,0 +1,70 @@
+# Copyright (c) Microsoft Corporation and contributors.
+# Licensed under the MIT License.
+
+import json
+import os
+import pickle
+import unittest
+
+from graspologic.layouts.colors import (
+    _get_colors,
+    categorical_colors,
+    sequential_colors,
+)
+
+_BUNDLED_THEME = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "..",
+    "graspologic",
+    "layouts",
+    "include",
+    "colors-100.json",
+)
+
+
+class TestColors(unittest.TestCase):
+    def test_bundled_pickle_matches_json(self):
+        pickled_theme = os.path.splitext(_BUNDLED_THEME)[0] + ".pkl"
+        with open(pickled_theme, "rb") as pickled_io:
+            pickled = pickle.load(pickled_io)
+        with open(_BUNDLED_THEME) as json_io:
+            self.assertEqual(pickled, json.load(json_io))
+
+    def test_get_colors_with_theme_path(self):
+        light = _get_colors(True, _BUNDLED_THEME)
+        dark = _get_colors(False, _BUNDLED_THEME)
+        self.assertIsInstance(light, dict)
+        self.assertIsInstance(dark, dict)
+        self.assertEqual(light, _get_colors(True, None))
+        self.assertEqual(dark, _get_colors(False, None))
+
+    def test_categorical_colors_orders_by_population(self):
+        partitions = {"a": 3, "b": 3, "c": 3, "d": 7, "e": 1, "f": 1}
+        nominal = _get_colors(True, None)["nominal"]
+        colors = categorical_colors(partitions)
+        self.assertEqual(nominal[0], colors["a"])
+        self.assertEqual(nominal[1], colors["e"])
+        self.assertEqual(nominal[2], colors["d"])
+        self.assertEqual(colors["a"], colors["b"])
+        self.assertEqual(colors["e"], colors["f"])
+
+    def test_sequential_colors_maps_range_to_endpoints(self):
+        sequential = _get_colors(True, None)["sequential"]
+        colors = sequential_colors({"a": 0.5, "b": 3.0, "c": 10.0})
+        self.assertEqual(sequential[0], colors["a"])
+        self.assertEqual(sequential[-1], colors["c"])
+
+        log_colors = sequential_colors({"a": 1, "b": 10, "c": 100}, use_log_scale=True)
+        self.assertEqual(sequential[(len(sequential) - 1) // 2], log_colors["b"])
+
+    def test_sequential_colors_log_scale_non_positive(self):
+        with self.assertRaises(ValueError):
+            sequential_colors({"a": 0, "b": 10}, use_log_scale=True)
+        with self.assertRaises(ValueError):
+            sequential_colors({"a": -1.0, "b": 10.0}, use_log_scale=True)
+
+    def test_sequential_colors_constant_values(self):
+        sequential = _get_colors(True, None)["sequential"]
+        colors = sequential_colors({"a": 2.0, "b": 2.0})
+        self.assertEqual({"a": sequential[0], "b": sequential[0]}, colors)
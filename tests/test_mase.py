@@ -53,6 +53,10 @@ def test_bad_inputs():
         wrong_diag_aug = "True"
         mase = MultipleASE(diag_aug=wrong_diag_aug)
 
+    with pytest.raises(ValueError):
+        "Invalid dtype"
+        mase = MultipleASE(dtype=np.int64)
+
     with pytest.raises(ValueError):
         "Test single graph input"
         MultipleASE().fit(single_graph)
@@ -86,6 +90,49 @@ def test_diag_aug():
     assert array_equal(mase_list, mase_arr)
 
 
+def test_full_algorithm_array_and_list():
+    np.random.seed(6)
+    graphs_list = [er_np(50, 0.3) for _ in range(3)]
+    graphs_arr = np.array(graphs_list)
+
+    # Stacked input is decomposed with a batched svd
+    mase_arr = MultipleASE(n_components=3, algorithm="full").fit(graphs_arr)
+    mase_list = MultipleASE(n_components=3, algorithm="full").fit(graphs_list)
+
+    np.testing.assert_allclose(
+        np.abs(mase_list.latent_left_), np.abs(mase_arr.latent_left_)
+    )
+    np.testing.assert_allclose(mase_list.singular_values_, mase_arr.singular_values_)
+
+    with pytest.raises(ValueError):
+        MultipleASE(n_components=51, algorithm="full").fit(graphs_arr)
+
+
+def test_dtype():
+    np.random.seed(7)
+    graphs = np.array([er_np(50, 0.3) for _ in range(3)])
+
+    mase = MultipleASE(n_components=2, dtype=np.float32).fit(graphs)
+    assert mase.latent_left_.dtype == np.float32
+    assert mase.scores_.dtype == np.float32
+
+    mase_64 = MultipleASE(n_components=2).fit(graphs)
+    np.testing.assert_allclose(
+        np.abs(mase_64.latent_left_), np.abs(mase.latent_left_), atol=1e-4
+    )
+
+
+def test_n_jobs():
+    np.random.seed(8)
+    graphs = [er_np(50, 0.3, directed=True) for _ in range(4)]
+
+    mase = MultipleASE(n_components=2).fit(graphs)
+    mase_parallel = MultipleASE(n_components=2, n_jobs=2).fit(graphs)
+
+    assert array_equal(mase.latent_left_, mase_parallel.latent_left_)
+    assert array_equal(mase.latent_right_, mase_parallel.latent_right_)
+
+
 def test_graph_clustering():
     """
     There should be 4 total clusters since 4 class problem.
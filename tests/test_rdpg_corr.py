@@ -60,6 +60,17 @@ class Test_RDPG_Corr(unittest.TestCase):
         correlation = np.corrcoef(g1, g2)[0, 1]
         self.assertTrue(np.isclose(correlation, self.r, atol=0.01))
 
+    def test_rdpg_corr_negative_r(self):
+        np.random.seed(5)
+        g1, g2 = rdpg_corr(np.full((20, 2), 0.5), None, -0.3)
+        self.assertTrue(g1.shape == (20, 20))
+
+        g1, g2 = rdpg_corr(self.X, self.Y, -0.3, directed=False, loops=False)
+        g1 = g1[np.where(~np.eye(g1.shape[0], dtype=bool))]
+        g2 = g2[np.where(~np.eye(g2.shape[0], dtype=bool))]
+        correlation = np.corrcoef(g1, g2)[0, 1]
+        self.assertTrue(np.isclose(correlation, -0.3, atol=0.02))
+
     # check P
     def test_p_is_close(self):
         P = p_from_latent(self.X, self.Y, rescale=False, loops=True)
@@ -3,10 +3,11 @@
 
 import numpy as np
 import pytest
-from numpy.testing import assert_equal
+from numpy.testing import assert_allclose, assert_equal
 from scipy.linalg import orth
+from scipy.stats import norm
 
-from graspologic.embed.svd import select_dimension
+from graspologic.embed.svd import _compute_likelihood, select_dimension
 from graspologic.simulations.simulations import sbm
 
 
@@ -109,3 +110,45 @@ def test_output_two_block_sbm():
 
     elbows, _ = select_dimension(A, n_elbows=2)
     assert_equal(elbows[0], 2)
+
+
+def loop_likelihood(arr):
+    """
+    Profile likelihoods computed one split at a time
+    """
+    n_elements = len(arr)
+    likelihoods = np.zeros(n_elements)
+    for idx in range(1, n_elements + 1):
+        s1 = arr[:idx]
+        s2 = arr[idx:]
+        if (s1.size == 1) & (s2.size == 1):
+            likelihoods[idx - 1] = -np.inf
+            continue
+        mu1 = np.mean(s1)
+        mu2 = np.mean(s2) if s2.size != 0 else -np.inf
+        variance = ((np.sum((s1 - mu1) ** 2) + np.sum((s2 - mu2) ** 2))) / (
+            n_elements - 1 - (idx < n_elements)
+        )
+        std = np.sqrt(variance)
+        likelihoods[idx - 1] = np.sum(norm.logpdf(s1, loc=mu1, scale=std)) + np.sum(
+            norm.logpdf(s2, loc=mu2, scale=std)
+        )
+    return likelihoods
+
+
+def test_compute_likelihood():
+    np.random.seed(2)
+    inputs = [
+        np.sort(np.random.normal(size=30))[::-1],
+        np.array([5.0, 2.0]),
+        # ties whose splits have no variance
+        np.array([0.3, 0.3, 0.3, 0.1, 0.1]),
+        np.array([7.0, 7.0, 7.0, 7.0, 2.0, 2.0, 2.0]),
+        np.full(5, 5.0),
+    ]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for arr in inputs:
+            assert_allclose(_compute_likelihood(arr), loop_likelihood(arr))
+
+        # no variance at all
+        assert np.all(np.isnan(_compute_likelihood(np.full(6, 0.1))))
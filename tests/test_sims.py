@@ -5,6 +5,7 @@ import unittest
 import graspologic as gs
 import numpy as np
 import networkx as nx
+from scipy.sparse import csr_matrix
 from graspologic.simulations import *
 from graspologic.utils.utils import (
     is_symmetric,
@@ -47,6 +48,101 @@ class Test_ER(unittest.TestCase):
         self.assertTrue(np.isclose(dind.sum() / float(len(dind)), self.p, atol=0.02))
         self.assertTrue(A.shape == (self.n, self.n))
 
+    def test_ernp_sparse(self):
+        np.random.seed(123456)
+        n = 1000
+        p = 0.01
+        for directed in [False, True]:
+            A = er_np(n, p, directed=directed)
+            dind = remove_diagonal(A)
+            self.assertTrue(np.isclose(dind.mean(), p, atol=0.001))
+            self.assertTrue(np.all(np.diag(A) == 0))
+            self.assertEqual(is_symmetric(A), not directed)
+            self.assertTrue(np.all(np.isin(A, [0, 1])))
+
+    def test_rng(self):
+        P = np.full((self.n, self.n), self.p)
+        samplers = [
+            lambda rng: er_np(self.n, self.p, rng=rng),
+            lambda rng: er_np(self.n, 0.01, directed=True, rng=rng),
+            lambda rng: er_nm(self.n, self.M, rng=rng),
+            lambda rng: sbm([10, 10], [[0.5, 0.1], [0.1, 0.5]], rng=rng),
+            lambda rng: sample_edges(P, rng=rng),
+        ]
+        for sampler in samplers:
+            A1 = sampler(np.random.default_rng(1))
+            A2 = sampler(np.random.default_rng(1))
+            self.assertTrue(np.array_equal(A1, A2))
+
+        with self.assertRaises(TypeError):
+            er_np(self.n, self.p, rng=1)
+
+
+class Test_Large(unittest.TestCase):
+    """
+    Graphs large enough that dense sampling takes several chunks of uniform draws
+    and symmetrizing takes several strips.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.n = 1500
+        # the block boundary is not aligned with the chunks or strips
+        cls.split = 700
+        cls.P = np.full((cls.n, cls.n), 0.1)
+        cls.P[: cls.split, : cls.split] = 0.8
+        cls.P[cls.split :, cls.split :] = 0.3
+
+    def rngs(self):
+        return [np.random.default_rng(1), np.random.RandomState(1)]
+
+    def assert_blocks(self, A, P, loops):
+        s = self.split
+        for rows in [slice(0, s), slice(s, None)]:
+            for cols in [slice(0, s), slice(s, None)]:
+                block = A[rows, cols]
+                p = P[rows, cols][0, 0]
+                if rows == cols:
+                    diag = np.diag(block)
+                    block = remove_diagonal(block)
+                    if loops:
+                        self.assertAlmostEqual(diag.mean(), p, delta=0.06)
+                    else:
+                        self.assertTrue(np.all(diag == 0))
+                self.assertAlmostEqual(block.mean(), p, delta=0.005)
+
+    def test_sample_edges(self):
+        P_directed = self.P.copy()
+        P_directed[self.split :, : self.split] = 0.5
+        for rng in self.rngs():
+            for directed in [False, True]:
+                P = P_directed if directed else self.P
+                for loops in [False, True]:
+                    A = sample_edges(P, directed=directed, loops=loops, rng=rng)
+                    self.assertTrue(np.all(np.isin(A, [0, 1])))
+                    self.assertEqual(is_symmetric(A), not directed)
+                    self.assert_blocks(A, P, loops)
+
+    def test_sbm(self):
+        n = [self.split, self.n - self.split]
+        for rng in self.rngs():
+            for directed in [False, True]:
+                for loops in [False, True]:
+                    A = sbm(n, [[0.8, 0.1], [0.1, 0.3]], directed, loops, rng=rng)
+                    self.assertEqual(is_symmetric(A), not directed)
+                    self.assert_blocks(A, self.P, loops)
+
+    def test_ernm_weighted(self):
+        m = 100000
+        wt = np.random.uniform
+        wtargs = dict(low=1, high=2)
+        for rng in self.rngs():
+            for loops in [False, True]:
+                A = er_nm(self.n, m, loops=loops, wt=wt, wtargs=wtargs, rng=rng)
+                self.assertTrue(is_symmetric(A))
+                self.assertEqual(np.count_nonzero(np.triu(A)), m)
+                self.assertEqual(is_loopless(A), not loops)
+
 
 class Test_ZINM(unittest.TestCase):
     @classmethod
@@ -372,6 +468,89 @@ class Test_WSBM(unittest.TestCase):
         label = [0, 0, 0, 1, 1, 1]
         self.assertTrue(np.allclose(l, label))
 
+    def test_sbm_sparse(self):
+        np.random.seed(2)
+        n = [400, 600]
+        p = np.array([[0.015, 0.002], [0.005, 0.01]])
+        for directed, loops in [(False, False), (True, True)]:
+            if not directed:
+                p = (p + p.T) / 2
+            A = sbm(n, p, directed=directed, loops=loops)
+            blocks = [slice(0, 400), slice(400, 1000)]
+            for i in range(2):
+                for j in range(2):
+                    block = A[blocks[i], blocks[j]]
+                    self.assertTrue(np.isclose(block.mean(), p[i, j], atol=0.001))
+            self.assertEqual(is_symmetric(A), not directed)
+            self.assertEqual(is_loopless(A), not loops)
+
+    def test_sbm_sparse_output(self):
+        np.random.seed(3)
+        n = [400, 600]
+        p = np.array([[0.015, 0.002], [0.002, 0.01]])
+        for directed, loops in [(False, False), (True, True)]:
+            A = sbm(n, p, directed=directed, loops=loops, sparse=True)
+            self.assertIsInstance(A, csr_matrix)
+            A = A.toarray()
+            blocks = [slice(0, 400), slice(400, 1000)]
+            for i in range(2):
+                for j in range(2):
+                    block = A[blocks[i], blocks[j]]
+                    self.assertTrue(np.isclose(block.mean(), p[i, j], atol=0.001))
+            self.assertEqual(is_symmetric(A), not directed)
+            self.assertEqual(is_loopless(A), not loops)
+
+        wt = [[np.random.poisson, np.random.normal]] * 2
+        wtargs = [[dict(lam=5), dict(loc=3, scale=1)]] * 2
+        A = sbm(n, p, directed=True, wt=wt, wtargs=wtargs, sparse=True)
+        self.assertTrue(np.isclose(A[:400, 400:].data.mean(), 3, atol=0.2))
+
+        with self.assertRaises(ValueError):
+            sbm(n, p, dc=np.random.uniform, sparse=True)
+
+    def test_sbm_sparse_dense_blocks(self):
+        np.random.seed(5)
+        n = [300, 200]
+        # most pairs of vertices in these blocks are edges
+        p = np.array([[1.0, 0.6], [0.6, 0.99]])
+        for directed, loops in [(False, False), (True, True)]:
+            A = sbm(n, p, directed=directed, loops=loops, sparse=True).toarray()
+            self.assertTrue(np.all(A[:300, :300] == 1 - np.eye(300) * (not loops)))
+            self.assertTrue(np.isclose(A[:300, 300:].mean(), 0.6, atol=0.01))
+            dind = remove_diagonal(A[300:, 300:])
+            self.assertTrue(np.isclose(dind.mean(), 0.99, atol=0.005))
+            self.assertEqual(is_symmetric(A), not directed)
+            self.assertEqual(is_loopless(A), not loops)
+
+    def test_sbm_batch(self):
+        n = [20, 30]
+        p = np.array([[0.6, 0.1], [0.1, 0.4]])
+        graphs = sbm_batch(n, p, 3, rng=np.random.default_rng(3))
+        self.assertEqual(graphs.shape, (3, 50, 50))
+        # the same stream of draws as sampling the graphs one at a time
+        rng = np.random.default_rng(3)
+        for A in graphs:
+            self.assertTrue(np.array_equal(A, sbm(n, p, rng=rng)))
+        self.assertEqual(sbm_batch(n, p, np.int64(2)).shape, (2, 50, 50))
+
+        np.random.seed(4)
+        graphs = sbm_batch([200, 300], p.T, 2, directed=True, loops=True)
+        for A in graphs:
+            self.assertTrue(np.isclose(A[:200, 200:].mean(), 0.1, atol=0.02))
+            self.assertFalse(is_symmetric(A))
+            self.assertFalse(is_loopless(A))
+
+        with self.assertRaises(ValueError):
+            sbm_batch(n, [[0.6, 0.1], [0.2, 0.4]], 3)
+        with self.assertRaises(ValueError):
+            sbm_batch(n, p, 0)
+        with self.assertRaises(TypeError):
+            sbm_batch(n, p, 1.5)
+        with self.assertRaises(TypeError):
+            sbm_batch(n, p, 2, directed="True")
+        with self.assertRaises(TypeError):
+            sbm_batch(n, p, 2, loops=1)
+
     def test_sbm(self):
         n = [50, 60, 70]
         vcount = np.cumsum(n)
@@ -848,6 +1027,12 @@ class Test_RDPG(unittest.TestCase):
             sample_edges(x3)  # wrong num dimensions
         with self.assertRaises(ValueError):
             sample_edges(x2)  # wrong shape for P
+        with self.assertRaises(ValueError):
+            sample_edges(np.full((2, 2), 1.5))  # probabilities above 1
+        with self.assertRaises(ValueError):
+            sample_edges(np.full((2, 2), -0.5))  # probabilities below 0
+        with self.assertRaises(ValueError):
+            sample_edges(np.array([[0.5, np.nan], [0.5, 0.5]]))  # nan probability
 
     def test_er_p_is_close(self):
         np.random.seed(8888)
@@ -8,6 +8,7 @@ from graspologic.simulations.simulations_corr import (
     sbm_corr,
 )
 import numpy as np
+from scipy.sparse import csr_matrix
 import pytest
 import warnings
 
@@ -44,6 +45,29 @@ class Test_Sample_Corr(unittest.TestCase):
         with pytest.raises(TypeError):
             sample_edges_corr(self.P, self.r, directed=False, loops=6)
 
+        with self.assertRaises(ValueError):
+            P = np.full((self.n, self.n), 1.5)
+            sample_edges_corr(P, self.R, directed=False, loops=False)
+
+        with self.assertRaises(ValueError):
+            P = np.full((self.n, self.n), -0.5)
+            sample_edges_corr(P, self.R, directed=False, loops=False)
+
+        with self.assertRaises(ValueError):
+            P = self.P.copy()
+            P[0, 1] = np.nan
+            sample_edges_corr(P, self.R, directed=False, loops=False)
+
+        with self.assertRaises(ValueError):
+            R = np.full((self.n, self.n), 1.5)
+            sample_edges_corr(self.P, R, directed=False, loops=False)
+
+        with self.assertRaises(ValueError):
+            # P * (1 - R) is above 1
+            P = np.full((self.n, self.n), 0.8)
+            R = np.full((self.n, self.n), -0.5)
+            sample_edges_corr(P, R, directed=False, loops=False)
+
     def test_sample_edges_corr(self):
         # P = self.p * np.ones((self.n, self.n))
         g1, g2 = sample_edges_corr(self.P, self.R, directed=False, loops=False)
@@ -124,6 +148,34 @@ class Test_ER_Corr(unittest.TestCase):
         self.assertTrue(g1.shape == (self.n, self.n))
         self.assertTrue(g2.shape == (self.n, self.n))
 
+    def test_er_corr_sparse_dense(self):
+        np.random.seed(6)
+        # p + r * (1 - p) is close to 1, so nearly every pair is an edge of g2
+        # wherever g1 has one
+        p = 0.95
+        g1, g2 = er_corr(self.n, p, self.r, directed=False, loops=False, sparse=True)
+        self.assertIsInstance(g1, csr_matrix)
+        self.assertIsInstance(g2, csr_matrix)
+        g1 = g1.toarray()
+        g2 = g2.toarray()
+        k1 = g1[np.where(~np.eye(self.n, dtype=bool))]
+        k2 = g2[np.where(~np.eye(self.n, dtype=bool))]
+        self.assertTrue(np.isclose(k1.mean(), p, atol=0.005))
+        self.assertTrue(np.isclose(k2.mean(), p, atol=0.005))
+        self.assertTrue(np.isclose(np.corrcoef(k1, k2)[0, 1], self.r, atol=0.05))
+        self.assertTrue(np.array_equal(g2, g2.T))
+        self.assertTrue(np.all(np.diag(g2) == 0))
+
+        g1, g2 = er_corr(self.n, 1.0, self.r, sparse=True)
+        self.assertEqual(g2.nnz, self.n * (self.n - 1))
+
+    def test_er_corr_negative_r(self):
+        np.random.seed(3)
+        g1, g2 = er_corr(self.n, 0.5, -0.5, directed=False, loops=False)
+        k1 = g1[np.where(~np.eye(self.n, dtype=bool))]
+        k2 = g2[np.where(~np.eye(self.n, dtype=bool))]
+        self.assertTrue(np.isclose(np.corrcoef(k1, k2)[0, 1], -0.5, atol=0.06))
+
 
 class Test_SBM_Corr(unittest.TestCase):
     @classmethod
@@ -198,3 +250,39 @@ class Test_SBM_Corr(unittest.TestCase):
         # check the dimension of input P and Rho
         self.assertTrue(g1.shape == (np.sum(self.n), np.sum(self.n)))
         self.assertTrue(g2.shape == (np.sum(self.n), np.sum(self.n)))
+
+    def test_sbm_corr_negative_r(self):
+        np.random.seed(4)
+        n = [20, 30]
+        g1, g2 = sbm_corr(n, [[0.5, 0.4], [0.4, 0.5]], -0.3)
+        self.assertTrue(g1.shape == (50, 50))
+        self.assertTrue(g2.shape == (50, 50))
+
+        g1, g2 = sbm_corr(self.n, self.p, -0.2, directed=False, loops=False)
+        # within the first community, where the edge probability is constant
+        block = slice(0, self.n[0])
+        off_diagonal = np.where(~np.eye(self.n[0], dtype=bool))
+        a, b = g1[block, block][off_diagonal], g2[block, block][off_diagonal]
+        correlation = np.corrcoef(a, b)[0, 1]
+        self.assertTrue(np.isclose(correlation, -0.2, atol=0.05))
+
+    def test_sbm_corr_sparse(self):
+        np.random.seed(4)
+        n = [400, 600]
+        p = np.array([[0.02, 0.005], [0.005, 0.01]])
+        g1, g2 = sbm_corr(n, p, self.r, directed=False, loops=False, sparse=True)
+        self.assertIsInstance(g1, csr_matrix)
+        self.assertIsInstance(g2, csr_matrix)
+        g1 = g1.toarray()
+        g2 = g2.toarray()
+        blocks = [slice(0, 400), slice(400, 1000)]
+        for i in range(2):
+            for j in range(2):
+                self.assertTrue(
+                    np.isclose(g2[blocks[i], blocks[j]].mean(), p[i, j], atol=0.002)
+                )
+        self.assertTrue(np.array_equal(g1, g1.T))
+        self.assertTrue(np.array_equal(g2, g2.T))
+        self.assertTrue(np.all(np.diag(g2) == 0))
+        output_r = np.corrcoef(g1.ravel(), g2.ravel())[0, 1]
+        self.assertTrue(np.isclose(output_r, self.r, atol=0.05))
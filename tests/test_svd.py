@@ -60,3 +60,14 @@ def test_outputs():
     atol = 1e-4
     assert_allclose(norm_full, norm_trunc, rtol, atol)
     assert_allclose(norm_full, norm_rand, rtol, atol)
+
+
+def test_randomized_svd_seed():
+    np.random.seed(1)
+    A = er_np(100, 0.3)
+
+    U1, D1, V1 = selectSVD(A, n_components=3, algorithm="randomized")
+    U2, D2, V2 = selectSVD(A, n_components=3, algorithm="randomized")
+    assert_equal(U1, U2)
+    assert_equal(D1, D2)
+    assert_equal(V1, V2)